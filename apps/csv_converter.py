@@ -1,9 +1,110 @@
 import streamlit as st
-import pandas as pd
 import io
-from utils import process_file
-from openpyxl.styles import numbers, Border, Side
+import numpy as np
+from utils import read_preview, write_xlsx, EXPORT_NUMBER_FORMATS
 from shared.common import app_header, app_footer, display_success
+from shared.cache import default_cache, fingerprint
+from shared.dates import describe_unparsed_dates
+from shared.preview import show_preview
+from shared.instrumentation import span
+from shared.jobs import default_jobs, FAILED, FINISHED_STATES, PROCESSED_REPORT_ARTIFACT
+from shared.job_progress import attach_job, show_job_progress, submit_once
+from shared.submission_index import default_submission_index
+
+APP_REGISTRATION = {
+    "name": "CSV to XLSX Converter",
+    "icon": "📊",
+    "description": "This is a tool used to convert the downloaded CFP credit report into a file that can be uploaded to the CFP Board site.",
+    "order": 3
+}
+
+# URL query parameter holding the ID of the report being shown
+JOB_QUERY_PARAM = 'cfp_job'
+
+def build_workbook(df_processed):
+    """Serialize the processed report to XLSX bytes"""
+    output = io.BytesIO()
+    write_xlsx([df_processed], output, number_formats=EXPORT_NUMBER_FORMATS)
+    return output.getvalue()
+
+def build_delta_workbook(df_export):
+    """Serialize a delta export, then remember its rows so delta mode leaves them out next time"""
+    workbook = build_workbook(df_export)
+    # Recorded only once the file exists, and only once per export since the workbook is cached
+    default_submission_index.record(df_export)
+    return workbook
+
+def load_processed_report(job_id):
+    """Processed report rows stored by a finished cfp_report job"""
+    return default_cache.get_or_compute(
+        fingerprint('cfp_report_rows', job_id),
+        lambda: default_jobs.read_frame(job_id, PROCESSED_REPORT_ARTIFACT)
+    )
+
+def show_report(status, delta_mode):
+    """Show a processed report from a finished job and offer it as a workbook"""
+    # Reruns reuse the rows read back from the job and the finished workbook
+    df_processed = load_processed_report(status['id'])
+
+    # Dates that could not be read are left blank instead of failing the whole file
+    unparsed_dates = status['result']['unparsed_dates']
+    if unparsed_dates:
+        st.warning(
+            f"{len(unparsed_dates)} completion date(s) could not be read and were left blank: "
+            f"{describe_unparsed_dates(unparsed_dates)}"
+        )
+
+    df_export = df_processed
+    export_key = fingerprint('cfp_report_xlsx', status['id'])
+    build = build_workbook
+    selection_key = f"cfp_delta_selection_{status['id']}"
+    if not delta_mode:
+        st.session_state.pop(selection_key, None)
+    else:
+        # The selection is kept while delta mode stays on, so the rerun after a download,
+        # which has just recorded these rows, still offers the same file
+        if selection_key not in st.session_state:
+            st.session_state[selection_key] = default_submission_index.new_rows_mask(df_processed).to_numpy()
+        is_new = st.session_state[selection_key]
+        df_export = df_processed[is_new]
+        export_key = fingerprint('cfp_report_delta_xlsx', status['id'], np.packbits(is_new).tobytes())
+        build = build_delta_workbook
+        st.info(f"{len(df_processed) - len(df_export):,} of {len(df_processed):,} rows were already submitted and are left out")
+
+        if df_export.empty:
+            st.warning("Every row in this file has already been submitted")
+            return
+
+    # Show processed data preview
+    st.markdown('<div class="sub-header">Processed Data Preview</div>', unsafe_allow_html=True)
+    show_preview(df_export, key='cfp_processed_preview')
+
+    # Add file name input field
+    output_filename = st.text_input(
+        "Enter the output file name",
+        value="converted_file.xlsx",
+        help="Enter the name for your output Excel file (must end with .xlsx)"
+    )
+
+    # Ensure filename ends with .xlsx
+    if not output_filename.endswith('.xlsx'):
+        output_filename += '.xlsx'
+
+    # The workbook is only built once the button is clicked
+    st.download_button(
+        label="Download XLSX file",
+        data=default_cache.deferred(export_key, lambda: build(df_export)),
+        file_name=output_filename,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+    # Show success message with statistics
+    success_msg = f"""
+    Conversion completed successfully!
+    - Total records processed: {len(df_export)}
+    - Columns mapped: {len(df_export.columns)}
+    """
+    display_success(success_msg)
 
 def main():
     app_header(
@@ -18,93 +119,39 @@ def main():
 
     uploaded_file = st.file_uploader("Choose a CSV file", type="csv")
 
+    delta_mode = st.checkbox(
+        "Only export rows not submitted before",
+        help="Leave out rows whose attendee, program and completion date were in an earlier delta-mode download, "
+             "and record the exported rows once their file is generated"
+    )
+
+    job_id = None
     if uploaded_file is not None:
         try:
-            # Read CSV file
-            df = pd.read_csv(uploaded_file)
+            upload_bytes = uploaded_file.getvalue()
 
-            # Show input data preview
+            # Show input data preview from a small read of the first rows
             st.markdown('<div class="sub-header">Input Data Preview</div>', unsafe_allow_html=True)
-            st.dataframe(df.head())
-
-            try:
-                # Process the file
-                df_processed = process_file(df)
-
-                # Show processed data preview
-                st.markdown('<div class="sub-header">Processed Data Preview</div>', unsafe_allow_html=True)
-                st.dataframe(df_processed.head())
-
-                # Create download button
-                output = io.BytesIO()
-                with pd.ExcelWriter(output, engine='openpyxl', datetime_format='mm/dd/yyyy') as writer:
-                    df_processed.to_excel(writer, index=False, sheet_name='Sheet1')
-
-                    # Get the workbook and worksheet
-                    workbook = writer.book
-                    worksheet = writer.sheets['Sheet1']
-
-                    # Get column indices
-                    cfp_program_id_col = df_processed.columns.get_loc('CFP Program ID') + 1
-                    attendee_id_col = df_processed.columns.get_loc('Attendee CFP Board ID') + 1
-
-                    # Apply formatting to numeric columns
-                    # CFP Program ID: General format, no commas
-                    for row in range(2, len(df_processed) + 2):  # Skip header row
-                        cell = worksheet.cell(row=row, column=cfp_program_id_col)
-                        cell.number_format = numbers.FORMAT_GENERAL
-
-                    # Attendee CFP Board ID: Number format without decimals
-                    for row in range(2, len(df_processed) + 2):  # Skip header row
-                        cell = worksheet.cell(row=row, column=attendee_id_col)
-                        cell.number_format = numbers.FORMAT_NUMBER
-
-                    # Remove cell borders for all cells
-                    no_border = Border(left=Side(style=None), 
-                                       right=Side(style=None),
-                                       top=Side(style=None),
-                                       bottom=Side(style=None))
-
-                    for row in worksheet.rows:
-                        for cell in row:
-                            cell.border = no_border
-
-                output.seek(0)
-
-                # Add file name input field
-                output_filename = st.text_input(
-                    "Enter the output file name",
-                    value="converted_file.xlsx",
-                    help="Enter the name for your output Excel file (must end with .xlsx)"
-                )
-
-                # Ensure filename ends with .xlsx
-                if not output_filename.endswith('.xlsx'):
-                    output_filename += '.xlsx'
-
-                st.download_button(
-                    label="Download XLSX file",
-                    data=output,
-                    file_name=output_filename,
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
-
-                # Show success message with statistics
-                success_msg = f"""
-                Conversion completed successfully!
-                - Total records processed: {len(df_processed)}
-                - Columns mapped: {len(df_processed.columns)}
-                """
-                display_success(success_msg)
-
-            except ValueError as e:
-                st.error(f"Error processing file: {str(e)}")
-            except Exception as e:
-                st.error(f"An unexpected error occurred: {str(e)}")
-
+            with span('read', 'cfp report preview', bytes=len(upload_bytes)):
+                preview = read_preview(upload_bytes)
+            st.dataframe(preview)
         except Exception as e:
             st.error(f"Error reading CSV file: {str(e)}")
-    
+            app_footer()
+            return
+
+        # The report is processed in the background; its ID goes in the URL so reruns and refreshes reattach to it
+        job_id = submit_once('cfp_report', [(uploaded_file.name, upload_bytes)])
+
+    status = attach_job(JOB_QUERY_PARAM, job_id)
+    if status is not None:
+        if status['state'] not in FINISHED_STATES:
+            show_job_progress(status['id'], "Processing report...")
+        elif status['state'] == FAILED:
+            st.error(f"Error processing file: {status['message']}")
+        else:
+            show_report(status, delta_mode)
+
     app_footer()
 
 if __name__ == "__main__":
@@ -1,69 +1,38 @@
 import streamlit as st
 import pandas as pd
 import io
-from shared.parser import ExamParser
-import chardet
-from docx import Document
-import re
+from shared.encoding import detect_encoding, decode_text
+from shared.cache import default_cache, fingerprint
+from shared.handoff import blanks_to_missing, to_parquet_bytes
+from shared.pipeline import exam_to_import_csv
+from shared.preview import show_preview
+from shared.assets import show_image
+from shared.question_utils import validate_raw_csv
+from shared.docx_tables import iter_answer_pairs
+from shared.instrumentation import span
+from shared.jobs import default_jobs, EXAM_QUESTIONS_ARTIFACT, FAILED, FINISHED_STATES
+from shared.job_progress import attach_job, show_job_progress, submit_once
+
+APP_REGISTRATION = {
+    "name": "Exam Quiz Converter",
+    "icon": "📝",
+    "description": "This is the first step to import the exams. Drop the author's file on and here an answer key is applicable.",
+    "order": 1
+}
+
+# URL query parameter holding the ID of the exam being shown
+JOB_QUERY_PARAM = 'exam_job'
 
 def read_docx_content(file_bytes):
-    """Read content from a .docx file."""
+    """Read the answer key tables from a .docx file."""
     try:
-        # Create a BytesIO object from the file bytes
-        doc = Document(io.BytesIO(file_bytes))
-
-        # Extract text from paragraphs and tables
-        content = []
-
-        # Debug print for tables
-        for table_idx, table in enumerate(doc.tables):
-            print(f"\nProcessing Table {table_idx + 1}:")
-            for row_idx, row in enumerate(table.rows):
-                row_text = [cell.text.strip() for cell in row.cells]
-                print(f"Row {row_idx + 1}: {row_text}")
-
-                # Skip empty rows
-                if not any(row_text):
-                    continue
-
-                # Process each cell in the row
-                for i in range(len(row_text)):
-                    # Try to find question number and answer pairs
-                    cell_text = row_text[i].strip()
-
-                    # Skip empty cells
-                    if not cell_text:
-                        continue
-
-                    # Check if this cell contains a question number
-                    match = re.match(r'(\d+)\.?\s*$', cell_text)
-                    if match and i + 1 < len(row_text):
-                        question_num = match.group(1)
-                        # Look at the next cell for the answer
-                        answer = row_text[i + 1].strip()
-                        if answer and re.match(r'^[A-Da-d]$', answer):
-                            content.append(f"{question_num}: {answer}")
-                            print(f"Found answer: Question {question_num}: {answer}")
-
-        # Join all content with newlines
-        full_content = '\n'.join(content)
-
-        # Clean up the content
-        full_content = re.sub(r'\s+', ' ', full_content)  # Replace multiple spaces with single space
-        full_content = re.sub(r'\n\s*\n', '\n', full_content)  # Remove empty lines
-
-        # Debug print
-        print("Extracted content from DOCX:", full_content)
-
-        return full_content, None
+        with span('read', 'docx answer key', bytes=len(file_bytes)) as s:
+            content = [f"{question_num}: {answer}" for question_num, answer in iter_answer_pairs(file_bytes)]
+            s.set(rows=len(content))
+        return ' '.join(content), None
     except Exception as e:
         return None, f"Error reading .docx file: {str(e)}"
 
-def detect_encoding(file_bytes):
-    """Detect the encoding of the uploaded file."""
-    result = chardet.detect(file_bytes)
-    return result['encoding']
-
 def read_file_content(uploaded_file):
     """Read file content with appropriate encoding."""
     try:
@@ -71,35 +40,139 @@ def read_file_content(uploaded_file):
         if uploaded_file.name.lower().endswith('.docx'):
             return read_docx_content(uploaded_file.getvalue())
 
-        # For .txt files, use existing logic
-        bytes_data = uploaded_file.getvalue()
-        encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1', 'utf-16']
-        content = None
-        used_encoding = None
-
-        for encoding in encodings:
-            try:
-                content = bytes_data.decode(encoding)
-                used_encoding = encoding
-                st.success(f"Successfully read file using {encoding} encoding")
-                break
-            except UnicodeDecodeError:
-                continue
-
-        if content is None:
-            detected = chardet.detect(bytes_data)
-            try:
-                content = bytes_data.decode(detected['encoding'] if detected['encoding'] else 'utf-8')
-                used_encoding = detected['encoding']
-                st.success(f"Successfully read file using detected encoding: {detected['encoding']}")
-            except:
-                raise UnicodeDecodeError("Could not decode file with any supported encoding")
+        # For .txt files, detect the encoding from a sample and decode in chunks,
+        # reading the upload buffer in place instead of copying it
+        with uploaded_file.getbuffer() as bytes_data:
+            with span('read', 'detect encoding', bytes=bytes_data.nbytes):
+                encoding = detect_encoding(bytes_data, upload_hash=fingerprint(bytes_data))
+            with span('decode', uploaded_file.name, bytes=bytes_data.nbytes):
+                content, used_encoding = decode_text(bytes_data, encoding)
 
+        st.success(f"Successfully read file using {used_encoding} encoding")
         return content, None
     except Exception as e:
         detailed_error = f"Error reading file: {str(e)}"
         return None, detailed_error
 
+def build_excel(df):
+    """Serialize parsed questions to XLSX bytes"""
+    with span('export', 'excel', rows=len(df)) as s:
+        excel_buffer = io.BytesIO()
+        df.to_excel(excel_buffer, index=False)
+        excel_data = excel_buffer.getvalue()
+        s.set(bytes=len(excel_data))
+    return excel_data
+
+def build_csv(df):
+    """Serialize parsed questions to CSV text"""
+    with span('export', 'csv', rows=len(df)) as s:
+        csv = df.to_csv(index=False)
+        s.set(bytes=len(csv))
+    return csv
+
+def build_parquet(df):
+    """Serialize parsed questions to a Parquet handoff file, recording whether they pass validation"""
+    # Blank cells are stored as missing so validation gives the same verdict as for the CSV export
+    df = blanks_to_missing(df)
+    is_valid, validation_message = validate_raw_csv(df.copy(deep=False))
+    return to_parquet_bytes(df, validated=is_valid, message=validation_message)
+
+def show_import_export(content, answer_key_content, category, include_ids):
+    """Convert the exam straight to the import CSV and offer it for download."""
+    if not category:
+        st.error("⚠️ Please enter a category before converting")
+        return
+
+    # Reruns reuse the converted file, so its IDs stay the same
+    is_valid, message, csv_data = default_cache.get_or_compute(
+        fingerprint('exam_import_csv', content, answer_key_content, category, include_ids),
+        lambda: exam_to_import_csv(content, category, answer_key_content, include_ids)
+    )
+
+    if not is_valid:
+        st.error(f"Validation failed: {message}")
+        return
+
+    st.success("Exam converted straight to the import format")
+    st.download_button(
+        label="Download Import File",
+        data=csv_data,
+        file_name="converted_exam_questions.csv",
+        mime="text/csv"
+    )
+
+def load_questions(job_id):
+    """Parsed questions stored by a finished exam job"""
+    return default_cache.get_or_compute(
+        fingerprint('exam_questions', job_id),
+        lambda: default_jobs.read_frame(job_id, EXAM_QUESTIONS_ARTIFACT)
+    )
+
+def show_questions(status):
+    """Show the questions parsed by a finished job and offer them for download"""
+    result = status['result']
+    st.success(f"Successfully read file using {result['encoding']} encoding")
+
+    df = load_questions(status['id'])
+
+    # Preview the data
+    st.subheader("Preview of Parsed Questions")
+    show_preview(df, key='exam_questions_preview')
+
+    if df.empty:
+        return
+
+    # Export options
+    st.subheader("Export Options")
+
+    # Each file is built only when its button is clicked, then cached for later clicks
+    export_key = status['id']
+
+    # Create download buttons
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        # Excel export
+        st.download_button(
+            label="Download as Excel",
+            data=default_cache.deferred(fingerprint('exam_xlsx', export_key), lambda: build_excel(df)),
+            file_name="exam_questions.xlsx",
+            mime="application/vnd.ms-excel"
+        )
+
+    with col2:
+        # CSV export
+        st.download_button(
+            label="Download as CSV",
+            data=default_cache.deferred(fingerprint('exam_csv', export_key), lambda: build_csv(df)),
+            file_name="exam_questions.csv",
+            mime="text/csv"
+        )
+
+    with col3:
+        # Parquet export keeps column types and records validation for the Question Converter
+        st.download_button(
+            label="Download as Parquet",
+            data=default_cache.deferred(fingerprint('exam_parquet', export_key), lambda: build_parquet(df)),
+            file_name="exam_questions.parquet",
+            mime="application/vnd.apache.parquet",
+            help="Typed export for the Question Converter, which skips re-validating it"
+        )
+
+    # Display success animation
+    show_image("pepe-pepe-wink.gif", caption="Processing complete! 🎉")
+
+    # Display statistics
+    st.subheader("File Statistics")
+    st.write(f"Total questions parsed: {result['questions']}")
+
+    # Show questions with missing data, as counted by the job
+    if result['missing_choices']:
+        st.warning(f"Found {result['missing_choices']} questions with missing answer choices")
+
+    if result['missing_correct']:
+        st.warning(f"Found {result['missing_correct']} questions with missing correct answers")
+
 def main():
     st.title("📝 Exam Question Converter")
     st.write("Convert exam questions from text format to structured spreadsheet")
@@ -118,81 +191,60 @@ def main():
     if has_separate_answers:
         answer_key_file = st.file_uploader("Upload your answer key file", type=['txt', 'docx'])
 
+    # One-shot mode goes straight to the import file the Question Converter would produce
+    one_shot = st.checkbox(
+        "Convert straight to import file",
+        help="Skip the Question Converter step and download the import-ready CSV directly. "
+             "Answer text is kept exactly as written, so values such as \"2.50\" or \"N/A\" are not "
+             "re-typed or treated as blank the way re-reading a CSV export would"
+    )
+    if one_shot:
+        category = st.text_input(
+            "Category",
+            help="Enter the category to be used in the converted file",
+            placeholder="Enter category (required)"
+        )
+        blank_ids = st.checkbox(
+            "Export with blank IDs",
+            help="Check this to export the file with blank ID column values (header will be kept)",
+            value=False
+        )
+
+    job_id = None
     if uploaded_file:
-        # Read and parse file
-        content, error = read_file_content(uploaded_file)
-
-        if error:
-            st.error(error)
-        else:
-            try:
-                # Initialize parser
-                parser = ExamParser()
-
-                # If we have a separate answer key, read and process it
-                answer_key_content = None
-                if has_separate_answers and answer_key_file:
-                    answer_key_content, key_error = read_file_content(answer_key_file)
-                    if key_error:
-                        st.error(f"Error reading answer key file: {key_error}")
-                        return
-
-                # Parse content with optional answer key
-                df = parser.process_file(content, answer_key_content if has_separate_answers else None)
-
-                # Preview the data
-                st.subheader("Preview of Parsed Questions")
-                st.dataframe(df)
-
-                if not df.empty:
-                    # Export options
-                    st.subheader("Export Options")
-
-                    # Create download buttons
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        # Excel export
-                        excel_buffer = io.BytesIO()
-                        df.to_excel(excel_buffer, index=False)
-                        excel_data = excel_buffer.getvalue()
-
-                        st.download_button(
-                            label="Download as Excel",
-                            data=excel_data,
-                            file_name="exam_questions.xlsx",
-                            mime="application/vnd.ms-excel"
-                        )
-
-                    with col2:
-                        # CSV export
-                        csv = df.to_csv(index=False)
-                        st.download_button(
-                            label="Download as CSV",
-                            data=csv,
-                            file_name="exam_questions.csv",
-                            mime="text/csv"
-                        )
-
-                    # Display success animation
-                    st.image("attached_assets/pepe-pepe-wink.gif", caption="Processing complete! 🎉")
-
-                    # Display statistics
-                    st.subheader("File Statistics")
-                    st.write(f"Total questions parsed: {len(df)}")
-
-                    # Show questions with missing data
-                    missing_answers = df[df[['answer choice A', 'answer choice B', 'answer choice C', 'answer choice D']].isna().any(axis=1)]
-                    if not missing_answers.empty:
-                        st.warning(f"Found {len(missing_answers)} questions with missing answer choices")
-
-                    missing_correct = df[df['Correct Answer'].isna()]
-                    if not missing_correct.empty:
-                        st.warning(f"Found {len(missing_correct)} questions with missing correct answers")
-
-            except Exception as e:
-                st.error(f"Error processing file: {str(e)}")
+        # If we have a separate answer key, read and process it
+        answer_key_content = None
+        if has_separate_answers and answer_key_file:
+            answer_key_content, key_error = read_file_content(answer_key_file)
+            if key_error:
+                st.error(f"Error reading answer key file: {key_error}")
+                return
+
+        if one_shot:
+            content, error = read_file_content(uploaded_file)
+            if error:
+                st.error(error)
+            else:
+                show_import_export(content, answer_key_content, category, not blank_ids)
+            return
+
+        # The exam is parsed in the background; its ID goes in the URL so reruns and refreshes reattach to it
+        job_id = submit_once(
+            'exam',
+            [(uploaded_file.name, uploaded_file.getvalue())],
+            answer_key_content=answer_key_content
+        )
+
+    if not one_shot:
+        status = attach_job(JOB_QUERY_PARAM, job_id)
+        if status is not None:
+            if status['state'] not in FINISHED_STATES:
+                show_job_progress(status['id'], "Parsing questions...")
+            elif status['state'] == FAILED:
+                st.error(f"Error processing file: {status['message']}")
                 st.write("Please make sure the file follows the expected format.")
+            else:
+                show_questions(status)
 
     # Add usage instructions
     with st.expander("📖 Usage Instructions"):
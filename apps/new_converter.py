@@ -1,6 +1,15 @@
 import streamlit as st
 from shared.common import app_header, app_footer
 
+# Template app: set "enabled" to True to show it in the navigation
+APP_REGISTRATION = {
+    "name": "New Converter Tool",
+    "icon": "🛠️",
+    "description": "This is a template for a new file conversion tool.",
+    "order": 4,
+    "enabled": False
+}
+
 def main():
     app_header(
         "New Converter Tool",
@@ -1,6 +1,15 @@
 import streamlit as st
 from shared.common import app_header, app_footer, display_success
 
+# Template app: set "enabled" to True to show it in the navigation
+APP_REGISTRATION = {
+    "name": "Third App Tool",
+    "icon": "🔍",
+    "description": "This is a template for another file processing tool.",
+    "order": 5,
+    "enabled": False
+}
+
 def main():
     app_header(
         "Third App Tool",
@@ -0,0 +1,263 @@
+"""Startup and per-rerun latency benchmarks for the Streamlit router and apps.
+
+Each app is driven headlessly through Streamlit's AppTest against generated
+uploads of increasing size. For every app and size the suite records cold
+import time, first-render time, rerun time and peak traced memory. Each run
+is appended to a JSON file so results can be compared across commits.
+
+Run from the repository root:
+
+    python -m benchmarks.app_benchmarks --sizes 100 1000 10000 --output bench_results.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = os.path.join(REPO_ROOT, 'main.py')
+
+DEFAULT_SIZES = [100, 1000, 10000]
+RENDER_TIMEOUT = 600
+# Seconds between status checks while waiting for a background job
+JOB_POLL_INTERVAL = 0.05
+
+class FakeUpload(io.BytesIO):
+    """In-memory stand-in for Streamlit's UploadedFile"""
+
+    def __init__(self, name, data, mime):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+        self.type = mime
+
+def cfp_report_upload(rows):
+    """CFP credit report CSV with the columns of the real export"""
+    lines = ['Last name,First name,Email,License number,Course,CFP Board Course ID,Completed,Credits']
+    for i in range(rows):
+        lines.append(
+            f'Last{i % 500},First{i % 300},user{i}@example.com,{100000 + i},'
+            f'"Course {i % 40}",{240000 + i % 40},"January {i % 28 + 1}, 2025",2'
+        )
+    return FakeUpload('report.csv', '\n'.join(lines).encode(), 'text/csv')
+
+def exam_upload(questions):
+    """Exam text file with asterisk-marked answers"""
+    blocks = []
+    for i in range(1, questions + 1):
+        blocks.append(
+            f"{i}. Which statement about annuity scenario {i} for the client's Inc. holdings is correct?\n"
+            f"A. The future value of all payments\n"
+            f"B. The sum of all payments\n"
+            f"C. *The current worth of all future payments\n"
+            f"D. The average of all payments\n"
+        )
+    return FakeUpload('exam.txt', '\n'.join(blocks).encode(), 'text/plain')
+
+def questions_upload(rows):
+    """Raw questions CSV as produced by the Exam Quiz Converter"""
+    lines = ['Question,answer choice A,answer choice B,answer choice C,answer choice D,Correct Answer']
+    for i in range(1, rows + 1):
+        lines.append(f'"{i}. Question number {i}?",Alpha {i},Beta {i},Gamma {i},Delta {i},Gamma {i}')
+    return FakeUpload('questions.csv', '\n'.join(lines).encode(), 'text/csv')
+
+def _fill_question_converter(at):
+    """Open the app, enter a category and press Process Files"""
+    at.run(timeout=RENDER_TIMEOUT)
+    at.text_input[0].input('Benchmark').run(timeout=RENDER_TIMEOUT)
+    at.button[0].click()
+
+# App name -> (module, fixture factory, extra interaction before the measured render)
+APPS = {
+    'Exam Quiz Converter': ('apps.exam_quiz_converter', exam_upload, None),
+    'Question Converter': ('apps.question_converter', questions_upload, _fill_question_converter),
+    'CSV to XLSX Converter': ('apps.csv_converter', cfp_report_upload, None),
+}
+
+class UploadPatch:
+    """Make st.file_uploader return a prepared upload instead of waiting for the browser"""
+
+    def __init__(self):
+        self.upload = None
+        self._original = None
+
+    def __enter__(self):
+        self._original = st.file_uploader
+
+        def file_uploader(label, *args, accept_multiple_files=False, **kwargs):
+            if self.upload is None:
+                return [] if accept_multiple_files else None
+            self.upload.seek(0)
+            return [self.upload] if accept_multiple_files else self.upload
+
+        st.file_uploader = file_uploader
+        return self
+
+    def __exit__(self, *exc):
+        st.file_uploader = self._original
+
+def measure_import(module):
+    """Cold import time of a module, in seconds, measured in a fresh interpreter"""
+    code = (
+        'import time; start = time.perf_counter(); '
+        f'import {module}; print(time.perf_counter() - start)'
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+def _timed_run(at):
+    """Render once and, if the app started a background job, keep polling until it has finished"""
+    from shared.jobs import default_jobs, FAILED, FINISHED_STATES
+
+    start = time.perf_counter()
+    at.run(timeout=RENDER_TIMEOUT)
+    job_ids = [value for key, value in at.query_params.items() if key.endswith('_job')]
+    while any((default_jobs.status(job_id) or {}).get('state', FAILED) not in FINISHED_STATES for job_id in job_ids):
+        time.sleep(JOB_POLL_INTERVAL)
+    if job_ids:
+        at.run(timeout=RENDER_TIMEOUT)
+    return time.perf_counter() - start
+
+def _errors(at):
+    return [str(exception.value) for exception in at.exception] + [error.value for error in at.error]
+
+def benchmark_router():
+    """Time the router's first render and rerun with no upload"""
+    at = AppTest.from_file(MAIN_SCRIPT, default_timeout=RENDER_TIMEOUT)
+    return {
+        'app': 'router',
+        'size': 0,
+        'import_s': measure_import('main'),
+        'first_render_s': _timed_run(at),
+        'rerun_s': _timed_run(at),
+        'errors': _errors(at),
+    }
+
+class JobStorePatch:
+    """Point the background job queue at a throwaway directory, so clearing it never touches real jobs"""
+
+    def __init__(self):
+        self.job_dir = None
+        self._original = None
+
+    def __enter__(self):
+        from shared.jobs import JobStore, default_jobs
+
+        self._original = default_jobs.store
+        self.job_dir = tempfile.mkdtemp(prefix='converter_bench_jobs_')
+        default_jobs.store = JobStore(self.job_dir)
+        return self
+
+    def __exit__(self, *exc):
+        from shared.jobs import default_jobs
+
+        default_jobs.store = self._original
+        shutil.rmtree(self.job_dir, ignore_errors=True)
+
+def benchmark_app(name, size, patch):
+    """Select an app in the router, feed it an upload of the given size and time its renders"""
+    from shared.cache import default_cache
+    from shared.jobs import default_jobs
+
+    module, make_upload, interact = APPS[name]
+    result = {'app': name, 'size': size, 'import_s': measure_import(module)}
+
+    def render(trace_memory):
+        # Start cold so the measured render does the full conversion
+        default_cache.clear()
+        # Only the benchmark's own job directory (see JobStorePatch) is cleared
+        default_jobs.store.prune(max_age_hours=0)
+        patch.upload = None
+        at = AppTest.from_file(MAIN_SCRIPT, default_timeout=RENDER_TIMEOUT).run()
+        radio = at.sidebar.radio[0]
+        radio.set_value(next(option for option in radio.options if option.endswith(name)))
+
+        patch.upload = make_upload(size)
+        if interact:
+            interact(at)
+
+        if trace_memory:
+            tracemalloc.start()
+        first_render = _timed_run(at)
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+        return at, first_render, peak
+
+    at, result['first_render_s'], _ = render(trace_memory=False)
+    result['rerun_s'] = _timed_run(at)
+    result['errors'] = _errors(at)
+
+    # Tracing slows execution, so memory is measured on a separate render
+    _, _, peak = render(trace_memory=True)
+    result['peak_mb'] = round(peak / (1024 * 1024), 2)
+    return result
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(sizes, apps):
+    results = [benchmark_router()]
+    with UploadPatch() as patch, JobStorePatch():
+        for name in apps:
+            for size in sizes:
+                results.append(benchmark_app(name, size, patch))
+                print(json.dumps(results[-1]), file=sys.stderr)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'streamlit': st.__version__,
+        'results': results,
+    }
+
+def append_run(path, run_result):
+    """Append a run to the JSON results file, creating it if needed"""
+    runs = []
+    if os.path.exists(path):
+        with open(path, encoding='utf-8') as f:
+            runs = json.load(f)
+    runs.append(run_result)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(runs, f, indent=2)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Rows or questions per generated upload')
+    parser.add_argument('--apps', nargs='+', choices=list(APPS), default=list(APPS),
+                        help='Apps to benchmark')
+    parser.add_argument('--output', default='bench_results.json',
+                        help='JSON file the run is appended to')
+    args = parser.parse_args(argv)
+    output = os.path.abspath(args.output)
+
+    # Apps resolve their assets relative to the working directory
+    os.chdir(REPO_ROOT)
+    sys.path.insert(0, REPO_ROOT)
+
+    run_result = run(args.sizes, args.apps)
+    append_run(output, run_result)
+    print(f"Wrote {len(run_result['results'])} results to {output}")
+
+if __name__ == '__main__':
+    main()
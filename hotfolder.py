@@ -0,0 +1,349 @@
+"""Headless hot-folder runner for the converters.
+
+Watches an inbox directory and sends each new file to the converter for the
+subdirectory it was dropped in:
+
+    cfp_reports/   CFP credit report CSVs   -> <name>.xlsx          (CSV to XLSX Converter)
+    exams/         exam .txt files          -> <name>.csv           (Exam Quiz Converter)
+    questions/     raw questions CSVs or    -> converted_<name>.csv (Question Converter)
+                   Parquet handoff files
+
+An exam's separate answer key sits next to it as <name>.key.txt or
+<name>.key.docx. Outputs are written atomically to the same subdirectory of
+the outbox, alongside a manifest.json recording every file processed. Files
+whose content (and options) were already converted are skipped, so a restart
+does not redo any work; files that failed are tried again once --retry-after
+seconds have passed.
+
+Run from the repository root:
+
+    python hotfolder.py --inbox hotfolder/in --outbox hotfolder/out --category "Retirement Planning"
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from shared.batch import convert_question_file, make_pool
+from shared.cache import fingerprint
+from shared.dates import describe_unparsed_dates
+from shared.docx_tables import iter_answer_pairs
+from shared.encoding import decode_text, detect_encoding
+from shared.parser import ExamParser
+from shared.question_utils import converted_filename
+from utils import process_file_to_xlsx
+
+logger = logging.getLogger('hotfolder')
+
+MANIFEST_NAME = 'manifest.json'
+# Seconds between scans of the inbox
+POLL_INTERVAL = 5.0
+# Files modified more recently than this are assumed to still be copying in
+SETTLE_SECONDS = 2.0
+# Seconds before a file whose conversion failed is tried again
+RETRY_AFTER = 300.0
+# Bytes read per step when hashing input files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+ANSWER_KEY_SUFFIXES = ('.key.txt', '.key.docx')
+
+@contextmanager
+def atomic_output(path, mode='wb', **kwargs):
+    """Write to a temporary file in the target directory and move it into place only once complete"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_text(path):
+    """Read a text upload, detecting its encoding the way the Exam Quiz Converter does"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    text, _ = decode_text(data, detect_encoding(data))
+    return text
+
+def read_answer_key(path):
+    """Read an answer key file into the text ExamParser expects"""
+    if path.lower().endswith('.docx'):
+        with open(path, 'rb') as f:
+            return ' '.join(f"{question_num}: {answer}" for question_num, answer in iter_answer_pairs(f.read()))
+    return read_text(path)
+
+def find_answer_key(path):
+    """Return the answer key dropped next to an exam file, if there is one"""
+    stem = os.path.splitext(path)[0]
+    for suffix in ANSWER_KEY_SUFFIXES:
+        if os.path.isfile(stem + suffix):
+            return stem + suffix
+    return None
+
+def convert_cfp_report(path, out_dir, options):
+    """CFP credit report CSV -> XLSX, streamed in chunks"""
+    target = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + '.xlsx')
+    unparsed_dates = []
+    with atomic_output(target) as f:
+        rows = process_file_to_xlsx(path, f, unparsed_dates=unparsed_dates)
+
+    message = f"{rows} records converted"
+    if unparsed_dates:
+        message += f", unreadable dates left blank in {describe_unparsed_dates(unparsed_dates)}"
+    return target, message
+
+def convert_exam(path, out_dir, options):
+    """Exam text file (plus optional answer key) -> questions CSV"""
+    key_path = find_answer_key(path)
+    answer_key_content = read_answer_key(key_path) if key_path else None
+    df = ExamParser().process_file(read_text(path), answer_key_content)
+    if df.empty:
+        raise ValueError("No questions found")
+
+    target = os.path.join(out_dir, os.path.splitext(os.path.basename(path))[0] + '.csv')
+    with atomic_output(target, 'w', encoding='utf-8', newline='') as f:
+        df.to_csv(f, index=False)
+
+    # The parser leaves an unresolved answer as '' rather than missing
+    missing_correct = int((df['Correct Answer'] == '').sum())
+    message = f"{len(df)} questions parsed"
+    if missing_correct:
+        message += f", {missing_correct} missing correct answers"
+    return target, message
+
+def convert_questions(path, out_dir, options):
+    """Raw questions CSV -> import CSV"""
+    name = os.path.basename(path)
+    with open(path, 'rb') as f:
+        result = convert_question_file(name, f.read(), options['category'], options['include_ids'])
+    if result['status'] != 'success':
+        raise ValueError(result['message'])
+
+    target = os.path.join(out_dir, converted_filename(name))
+    with atomic_output(target, 'w', encoding='utf-8', newline='') as f:
+        result['df'].to_csv(f, index=False)
+    return target, result['message']
+
+# Inbox subdirectory -> (converter, accepted extensions)
+ROUTES = {
+    'cfp_reports': (convert_cfp_report, ('.csv',)),
+    'exams': (convert_exam, ('.txt',)),
+    'questions': (convert_questions, ('.csv', '.parquet')),
+}
+
+def run_job(route, path, out_dir, options):
+    """Run one conversion in a worker process and describe the outcome for the manifest"""
+    converter, _ = ROUTES[route]
+    try:
+        target, message = converter(path, out_dir, options)
+        return {'status': 'success', 'output': target, 'message': message}
+    except Exception as e:
+        return {'status': 'error', 'output': None, 'message': str(e)}
+
+def file_digest(path):
+    """SHA-256 of a file's contents, read in bounded chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class HotFolder:
+    """
+    Poll an inbox, convert new files in a bounded process pool and record them in a manifest
+
+    Each file is identified by the hash of its content, its dependencies (an
+    exam's answer key) and the conversion options, so renamed copies are
+    skipped and edited files are converted again.
+    """
+
+    def __init__(self, inbox, outbox, category=None, include_ids=True, workers=None, settle=SETTLE_SECONDS,
+                 retry_after=RETRY_AFTER):
+        self.inbox = os.path.abspath(inbox)
+        self.outbox = os.path.abspath(outbox)
+        self.settle = settle
+        self.retry_after = retry_after
+        self.workers = workers or os.cpu_count() or 1
+        self.options = {'category': category, 'include_ids': include_ids}
+        self.manifest_path = os.path.join(self.outbox, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+        # Files seen at a given size and modification time, so unchanged files are not hashed again
+        self._known = {tuple(entry['stat']): key for key, entry in self.manifest.items() if entry.get('stat')}
+        self._in_flight = {}
+        # Keys converted (or attempted) since this process started
+        self._attempted = set()
+
+        self.routes = dict(ROUTES)
+        if not category:
+            logger.warning("No --category given; raw questions CSVs will not be converted")
+            del self.routes['questions']
+
+        for route in self.routes:
+            os.makedirs(os.path.join(self.inbox, route), exist_ok=True)
+            os.makedirs(os.path.join(self.outbox, route), exist_ok=True)
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self):
+        with atomic_output(self.manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+
+    def scan(self):
+        """Yield (route, path, input paths, stat signature) for every settled input file"""
+        now = time.time()
+        for route, (_, extensions) in self.routes.items():
+            route_dir = os.path.join(self.inbox, route)
+            for entry in sorted(os.scandir(route_dir), key=lambda e: e.name):
+                name = entry.name.lower()
+                if not entry.is_file() or name.startswith(('.', '~$')) or not name.endswith(extensions):
+                    continue
+                if name.endswith(ANSWER_KEY_SUFFIXES):
+                    continue
+
+                paths = [entry.path]
+                if route == 'exams':
+                    key_path = find_answer_key(entry.path)
+                    if key_path:
+                        paths.append(key_path)
+
+                stats = [os.stat(path) for path in paths]
+                if any(now - stat.st_mtime < self.settle for stat in stats):
+                    continue
+
+                signature = [route]
+                for path, stat in zip(paths, stats):
+                    signature += [os.path.relpath(path, self.inbox), stat.st_size, stat.st_mtime_ns]
+                yield route, entry.path, paths, signature
+
+    def job_key(self, route, paths):
+        """Content hash of a job's input files and the options that affect its output"""
+        options = self.options if route == 'questions' else {}
+        return fingerprint(route, [file_digest(path) for path in paths], options)
+
+    def is_done(self, key, once=False):
+        """Whether the manifest shows a job needs no more work: it succeeded, or failed too recently to retry"""
+        entry = self.manifest.get(key)
+        if entry is None:
+            return False
+        # A single pass tries each file at most once
+        if entry['status'] == 'success' or (once and key in self._attempted):
+            return True
+        failed_at = datetime.fromisoformat(entry['processed_at']).timestamp()
+        return time.time() - failed_at < self.retry_after
+
+    def submit_new(self, executor, once=False):
+        """Submit unprocessed files until every worker is busy, returning how many were submitted"""
+        submitted = 0
+        for route, path, paths, signature in self.scan():
+            if len(self._in_flight) >= self.workers:
+                break
+
+            options_key = json.dumps(self.options, sort_keys=True) if route == 'questions' else ''
+            stat_key = tuple(signature + [options_key])
+            key = self._known.get(stat_key)
+            if key is None:
+                key = self.job_key(route, paths)
+                self._known[stat_key] = key
+
+            if self.is_done(key, once) or any(job['key'] == key for job in self._in_flight.values()):
+                continue
+
+            out_dir = os.path.join(self.outbox, route)
+            future = executor.submit(run_job, route, path, out_dir, self.options)
+            self._in_flight[future] = {'key': key, 'route': route, 'path': path, 'stat': list(stat_key)}
+            submitted += 1
+            logger.info("Converting %s", os.path.relpath(path, self.inbox))
+        return submitted
+
+    def record(self, future):
+        job = self._in_flight.pop(future)
+        self._attempted.add(job['key'])
+        try:
+            result = future.result()
+        except Exception as e:
+            # The worker itself failed (e.g. it was killed), not the conversion
+            result = {'status': 'error', 'output': None, 'message': str(e)}
+
+        self.manifest[job['key']] = {
+            'route': job['route'],
+            'source': os.path.relpath(job['path'], self.inbox),
+            'output': os.path.relpath(result['output'], self.outbox) if result['output'] else None,
+            'status': result['status'],
+            'message': result['message'],
+            'stat': job['stat'],
+            'processed_at': datetime.now(timezone.utc).isoformat(),
+        }
+        self._save_manifest()
+
+        log = logger.info if result['status'] == 'success' else logger.error
+        log("%s %s: %s", result['status'], self.manifest[job['key']]['source'], result['message'])
+
+    def run(self, once=False, interval=POLL_INTERVAL):
+        """Process files until interrupted, or until the inbox has nothing new when once is set"""
+        executor = make_pool(self.workers)
+        try:
+            while True:
+                submitted = self.submit_new(executor, once)
+
+                if not self._in_flight:
+                    if once and not submitted:
+                        return
+                    time.sleep(interval)
+                    continue
+
+                done, _ = wait(list(self._in_flight), timeout=interval, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    broken = broken or isinstance(future.exception(), BrokenProcessPool)
+                    self.record(future)
+
+                if broken:
+                    # A worker died and took the pool down with it; every job still on it fails too
+                    logger.warning("Worker pool broke; starting a new one")
+                    for future in wait(list(self._in_flight)).done:
+                        self.record(future)
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    executor = make_pool(self.workers)
+        finally:
+            executor.shutdown()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--inbox', default='hotfolder/in', help='Directory watched for new files')
+    parser.add_argument('--outbox', default='hotfolder/out', help='Directory converted files and the manifest are written to')
+    parser.add_argument('--category', help='Category for converted questions; questions/ is ignored without it')
+    parser.add_argument('--blank-ids', action='store_true', help='Export converted questions with blank IDs')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes, defaults to the CPU count')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='Seconds between inbox scans')
+    parser.add_argument('--settle', type=float, default=SETTLE_SECONDS,
+                        help='Seconds a file must be unmodified before it is picked up')
+    parser.add_argument('--retry-after', type=float, default=RETRY_AFTER,
+                        help='Seconds before a file whose conversion failed is tried again')
+    parser.add_argument('--once', action='store_true', help='Convert what is in the inbox and exit')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    hot_folder = HotFolder(args.inbox, args.outbox, category=args.category, include_ids=not args.blank_ids,
+                           workers=args.workers, settle=0 if args.once else args.settle, retry_after=args.retry_after)
+    try:
+        hot_folder.run(once=args.once, interval=args.interval)
+    except KeyboardInterrupt:
+        logger.info("Stopped")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+import ast
+import importlib
+import os
+from functools import lru_cache
+
+# Directory scanned for apps, next to main.py
+APPS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'apps')
+
+# Module-level name an app assigns its registration dict to
+REGISTRATION_HOOK = 'APP_REGISTRATION'
+
+@lru_cache(maxsize=None)
+def discover_apps(apps_dir=APPS_DIR):
+    """
+    Find the apps in apps_dir that declare a registration hook, without importing them
+
+    An app registers itself with a literal module-level dict, e.g.
+
+        APP_REGISTRATION = {
+            "name": "CSV to XLSX Converter",
+            "icon": "📊",
+            "description": "...",
+            "order": 3,
+        }
+
+    Optional keys are "function" (entry point name, default "main") and
+    "enabled" (default True). The dict is read from the source with ast, so
+    an app's heavy imports only happen once it is selected.
+
+    Returns:
+        dict: App name -> info dict with icon, description, module and function, in display order
+    """
+    apps = []
+    for filename in sorted(os.listdir(apps_dir)):
+        if not filename.endswith('.py') or filename.startswith('_'):
+            continue
+
+        registration = _read_registration(os.path.join(apps_dir, filename))
+        if registration is None or not registration.get('enabled', True):
+            continue
+
+        apps.append({
+            'name': registration['name'],
+            'icon': registration.get('icon', ''),
+            'description': registration.get('description', ''),
+            'order': registration.get('order', len(apps) + 1),
+            'module': f"apps.{filename[:-3]}",
+            'function': registration.get('function', 'main')
+        })
+
+    apps.sort(key=lambda app: app['order'])
+    return {app['name']: app for app in apps}
+
+def _read_registration(path):
+    """Return the literal registration dict assigned in a module's source, or None"""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    for node in tree.body:
+        if not isinstance(node, ast.Assign):
+            continue
+        if any(isinstance(target, ast.Name) and target.id == REGISTRATION_HOOK for target in node.targets):
+            return ast.literal_eval(node.value)
+    return None
+
+def load_app(app_info):
+    """Import an app's module on first use and return its entry point"""
+    module = importlib.import_module(app_info['module'])
+    return getattr(module, app_info['function'])
@@ -0,0 +1,49 @@
+import io
+import tempfile
+import zipfile
+
+# Archives larger than this spill from memory to a temporary file on disk
+ZIP_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+class SpooledZipWriter:
+    """
+    Build a ZIP archive incrementally in a spooled temporary file
+
+    Members are compressed as they are added, and the archive only spills to
+    disk once it grows past max_memory bytes.
+    """
+
+    def __init__(self, max_memory=ZIP_SPOOL_MAX_MEMORY):
+        self.buffer = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._zip = zipfile.ZipFile(self.buffer, 'w', zipfile.ZIP_DEFLATED)
+        self.count = 0
+
+    def add_dataframe(self, filename, df):
+        """
+        Write a dataframe as a CSV member, streaming it straight into the archive
+
+        Produces the same bytes as convert_df_to_csv without building the CSV string.
+
+        Args:
+            filename (str): Name of the member inside the archive
+            df (pandas.DataFrame): Dataframe to write
+        """
+        with io.TextIOWrapper(self._zip.open(filename, 'w'), encoding='utf-8', newline='') as member:
+            df.to_csv(member, index=False)
+        self.count += 1
+
+    def finish(self):
+        """
+        Finalize the archive
+
+        Returns:
+            file: The archive file, rewound to the start and ready to be read
+        """
+        self._zip.close()
+        self.buffer.seek(0)
+        return self.buffer
+
+    def discard(self):
+        """Close the archive and release its buffer without using it"""
+        self._zip.close()
+        self.buffer.close()
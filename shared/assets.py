@@ -0,0 +1,80 @@
+import base64
+import mimetypes
+import os
+import re
+from functools import lru_cache
+
+import streamlit as st
+
+# Assets live in static/ next to main.py, which Streamlit serves at app/static/ when
+# server.enableStaticServing is on
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+STATIC_URL = 'app/static'
+
+@lru_cache(maxsize=None)
+def read_asset(name):
+    """Read an asset from the static directory once per process"""
+    with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+        return f.read()
+
+@lru_cache(maxsize=None)
+def asset_data_uri(name):
+    """Base64 data URI for an asset, encoded once per process"""
+    mime = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    return f"data:{mime};base64,{base64.b64encode(read_asset(name)).decode()}"
+
+def static_serving_enabled():
+    return bool(st.get_option('server.enableStaticServing'))
+
+def asset_url(name):
+    """
+    URL for an asset in HTML
+
+    With static serving on, the browser fetches the file once and caches it
+    (Streamlit sends ETag and Last-Modified headers). Otherwise the cached
+    data URI is inlined.
+    """
+    if static_serving_enabled():
+        return f"{STATIC_URL}/{name}"
+    return asset_data_uri(name)
+
+@lru_cache(maxsize=None)
+def minify_css(css):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+@lru_cache(maxsize=None)
+def minify_js(js):
+    """Drop comment lines, indentation and blank lines from a script, keeping line breaks"""
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+@lru_cache(maxsize=None)
+def _style_tag(name):
+    return f"<style>{minify_css(read_asset(name).decode('utf-8'))}</style>"
+
+@lru_cache(maxsize=None)
+def _script_tag(name):
+    return f"<script>{minify_js(read_asset(name).decode('utf-8'))}</script>"
+
+def inject_stylesheet(name):
+    """Add a stylesheet from the static directory to the page, minified once per process"""
+    st.markdown(_style_tag(name), unsafe_allow_html=True)
+
+def inject_script(name):
+    """Add a script from the static directory to the page, minified once per process"""
+    st.markdown(_script_tag(name), unsafe_allow_html=True)
+
+def show_image(name, caption=None):
+    """Display an image asset, by URL when static serving is on so reruns do not resend it"""
+    if static_serving_enabled():
+        st.markdown(f'<img src="{asset_url(name)}" alt="{caption or ""}" style="max-width: 100%;">',
+                    unsafe_allow_html=True)
+        if caption:
+            st.caption(caption)
+    else:
+        st.image(read_asset(name), caption=caption)
@@ -0,0 +1,149 @@
+import io
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from shared.cache import default_cache, fingerprint
+from shared.handoff import is_prevalidated, read_parquet_handoff
+from shared.instrumentation import span
+from shared.question_utils import validate_raw_csv, transform_csv
+
+# Pool workers come from a fork server (or are spawned where there is none) instead of
+# being forked from the app, whose Streamlit and job threads may hold locks at fork time
+POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
+def seed_worker():
+    """
+    Reseed the random module in each pool worker
+
+    Workers forked from the same fork server inherit its random state, which
+    would give every worker the same starting IDs for its first file.
+    """
+    random.seed()
+
+def make_pool(max_workers):
+    """
+    Process pool for converting question files, with workers started from POOL_CONTEXT and reseeded
+
+    Args:
+        max_workers (int): Worker processes to start
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The pool
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=POOL_CONTEXT, initializer=seed_worker)
+
+def convert_question_file(name, data, category, include_ids=True):
+    """
+    Read, validate and transform a single raw questions CSV or Parquet handoff file
+
+    Errors are captured in the returned result instead of being raised, so one
+    bad file never affects the rest of a batch. Parquet files exported by the
+    Exam Quiz Converter skip validation when their metadata shows it already
+    passed on exactly this data.
+
+    Args:
+        name (str): Original file name
+        data (bytes): Raw CSV or Parquet bytes
+        category (str): Category value to use in the output
+        include_ids (bool): Whether to include ID values or leave them blank
+
+    Returns:
+        dict: Result with 'name', 'df', 'status' ('success' or 'error') and 'message'
+    """
+    try:
+        if name.lower().endswith('.parquet'):
+            df, handoff = read_parquet_handoff(data)
+            prevalidated = is_prevalidated(df, handoff)
+        else:
+            with span('read', name, bytes=len(data)) as s:
+                df = pd.read_csv(io.BytesIO(data))
+                s.set(rows=len(df))
+            prevalidated = False
+
+        if prevalidated:
+            is_valid, message = True, "Validated by the Exam Quiz Converter"
+        else:
+            is_valid, message = validate_raw_csv(df)
+
+        if not is_valid:
+            return {'name': name, 'df': None, 'status': 'error', 'message': message}
+
+        converted_df = transform_csv(df, category=category, include_ids=include_ids)
+        return {'name': name, 'df': converted_df, 'status': 'success', 'message': 'Successfully converted'}
+
+    except Exception as e:
+        return {'name': name, 'df': None, 'status': 'error', 'message': str(e)}
+
+def convert_question_files(files, category, include_ids=True, max_workers=None, on_progress=None):
+    """
+    Convert a batch of raw questions CSVs, spreading the files across a process pool
+
+    Args:
+        files (list): (name, bytes) pairs to convert
+        category (str): Category value to use in the output
+        include_ids (bool): Whether to include ID values or leave them blank
+        max_workers (int): Worker processes to use, defaults to the CPU count
+        on_progress (callable): Called as on_progress(done, total, result) in the
+            calling thread each time a file finishes
+
+    Returns:
+        list: One result dict per file (see convert_question_file), in input order
+    """
+    files = list(files)
+    total = len(files)
+    results = [None] * total
+    done = 0
+
+    def finish(idx, result, key=None):
+        nonlocal done
+        if key is not None:
+            # The cache keeps the compact Parquet form of the converted frame, and hits rebuild it
+            parquet = None if result['df'] is None else result['df'].to_parquet(index=False)
+            default_cache.put(key, dict(result, df=parquet))
+        results[idx] = result
+        done += 1
+        if on_progress:
+            on_progress(done, total, result)
+
+    # Files already converted with the same options are served from the cache
+    pending = []
+    for idx, (name, data) in enumerate(files):
+        key = fingerprint('question_file', data, category, include_ids)
+        cached = default_cache.get(key)
+        if cached is not None:
+            df = None if cached['df'] is None else pd.read_parquet(io.BytesIO(cached['df']))
+            finish(idx, dict(cached, name=name, df=df))
+        else:
+            pending.append((idx, name, data, key))
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(pending))
+
+    # A pool only pays for itself when there is more than one file to spread
+    if max_workers <= 1:
+        for idx, name, data, key in pending:
+            finish(idx, convert_question_file(name, data, category, include_ids), key)
+        return results
+
+    with make_pool(max_workers) as executor:
+        futures = {
+            executor.submit(convert_question_file, name, data, category, include_ids): (idx, name, key)
+            for idx, name, data, key in pending
+        }
+
+        for future in as_completed(futures):
+            idx, name, key = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself failed (e.g. it was killed), not the conversion
+                result = {'name': name, 'df': None, 'status': 'error', 'message': str(e)}
+                key = None
+            finish(idx, result, key)
+
+    return results
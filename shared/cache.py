@@ -0,0 +1,219 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Memory budget for cached results, in megabytes
+CACHE_MEMORY_MB = int(os.environ.get('CONVERTER_CACHE_MB', '256'))
+# Optional directory for the on-disk tier and its budget in megabytes
+CACHE_DIR = os.environ.get('CONVERTER_CACHE_DIR') or None
+CACHE_DISK_MB = int(os.environ.get('CONVERTER_CACHE_DISK_MB', '1024'))
+
+def fingerprint(*parts):
+    """
+    Build a content hash from upload bytes, text, dataframes and conversion options
+
+    Args:
+        *parts: Values that together identify a result
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        _update_digest(digest, part)
+    return digest.hexdigest()
+
+def _update_digest(digest, part):
+    """Feed one part into the digest, tagged with its type and length so parts cannot run together"""
+    if isinstance(part, pd.DataFrame):
+        data = repr((list(part.columns), [str(dtype) for dtype in part.dtypes])).encode()
+        data += pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes()
+        tag = b'frame'
+    elif isinstance(part, (bytes, bytearray, memoryview)):
+        # Hash buffers in place rather than copying large uploads
+        data = memoryview(part).cast('B')
+        tag = b'bytes'
+    elif isinstance(part, str):
+        data = part.encode('utf-8', 'surrogatepass')
+        tag = b'str'
+    elif isinstance(part, dict):
+        data = repr(sorted(part.items())).encode()
+        tag = b'dict'
+    else:
+        data = repr(part).encode()
+        tag = b'repr'
+
+    digest.update(tag + b':' + str(len(data)).encode() + b':')
+    digest.update(data)
+
+def estimate_size(value):
+    """Approximate the memory held by a cached value, in bytes"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value.values())
+    return sys.getsizeof(value)
+
+class ResultCache:
+    """
+    Thread-safe LRU cache for parsed dataframes and finished exports
+
+    Entries are evicted least recently used first once the memory budget is
+    exceeded. When a directory is given, entries are also pickled to disk and
+    read back on a memory miss, so they survive evictions and restarts.
+
+    Cached values are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes=CACHE_MEMORY_MB * 1024 * 1024, disk_dir=None, max_disk_bytes=CACHE_DISK_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key, default=None):
+        """Return the cached value for key, checking memory first and then disk"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+        value = self._read_disk(key)
+        if value is None:
+            return default
+
+        self._remember(key, value)
+        return value
+
+    def put(self, key, value):
+        """Store a value in memory and, if enabled, on disk"""
+        self._remember(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def deferred(self, key, compute):
+        """
+        Wrap a cached computation in a zero-argument callable
+
+        Nothing is computed until the callable is first called, which suits
+        download buttons that should only build their file when clicked.
+
+        Args:
+            key (str): Cache key, usually from fingerprint()
+            compute (callable): Builds the value on a miss
+
+        Returns:
+            callable: Returns the cached value, computing it on first use
+        """
+        return lambda: self.get_or_compute(key, compute)
+
+    def clear(self):
+        """Drop every entry held in memory"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key, value):
+        """Add a value to the memory tier, evicting least recently used entries to fit the budget"""
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+
+            # Values larger than the whole budget are only kept on disk
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pkl")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+
+        try:
+            with open(self._disk_path(key), 'rb') as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        # Refresh the modification time so disk pruning is least recently used as well
+        try:
+            os.utime(self._disk_path(key))
+        except OSError:
+            pass
+        return value
+
+    def _write_disk(self, key, value):
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._prune_disk()
+
+    def _prune_disk(self):
+        """Delete the least recently used files until the disk tier fits its budget"""
+        files = []
+        total = 0
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if not name.endswith('.pkl'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+# Process-wide cache shared by all converters
+default_cache = ResultCache(disk_dir=CACHE_DIR)
@@ -0,0 +1,172 @@
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Date formats seen in CFP credit reports, tried in order on each distinct value
+DATE_FORMATS = [
+    '%B %d, %Y',           # January 15, 2025
+    '%m/%d/%Y',            # 01/15/2025
+    '%Y-%m-%d',            # 2025-01-15
+    '%b %d, %Y',           # Jan 15, 2025
+    '%m/%d/%y',            # 01/15/25
+    '%m/%d/%Y %I:%M %p',   # 01/15/2025 10:30 AM
+    '%m/%d/%Y %H:%M',      # 01/15/2025 10:30
+    '%Y-%m-%d %H:%M:%S',   # 2025-01-15 10:30:00
+]
+
+# Short date format of the CFP Board upload
+OUTPUT_DATE_FORMAT = '%m/%d/%Y'
+
+# Distinct values remembered between calls before the memo is reset
+MAX_MEMO_SIZE = 100000
+
+NAT = np.datetime64('NaT', 'ns')
+
+class DateNormalizer:
+    """
+    Parse and format report dates by distinct value
+
+    Completion dates repeat heavily, so each distinct string is parsed (and
+    each distinct date formatted) once and the results are mapped back onto
+    the rows. Results are memoized across calls, so later chunks of the same
+    report reuse the work done for earlier ones.
+    """
+
+    def __init__(self, formats=DATE_FORMATS):
+        self.formats = list(formats)
+        self._parsed = {}
+        self._formatted = {}
+        self._lock = threading.Lock()
+
+    def parse(self, series):
+        """
+        Convert a column of date strings to datetimes
+
+        Each distinct value is tried against the known formats in order, then
+        with pandas' own inference. Values that still fail become NaT and are
+        reported instead of failing the whole column.
+
+        Args:
+            series (pandas.Series): Date strings, plain or categorical; missing and empty values stay NaT
+
+        Returns:
+            tuple: (pandas.Series, list) the datetime column and (row label, value) pairs that could not be parsed
+        """
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        elif series.dtype == object:
+            codes, uniques = pd.factorize(series)
+        else:
+            return pd.to_datetime(series), []
+
+        # Empty strings are missing dates, not unparseable ones
+        empty = np.flatnonzero(np.asarray(uniques, dtype=object) == '')
+        if len(empty):
+            codes = np.where(np.isin(codes, empty), -1, codes)
+        parsed = np.array(self._lookup(self._parsed, list(uniques), self._parse_values), dtype='datetime64[ns]')
+
+        values = parsed[codes] if len(parsed) else np.full(len(codes), NAT)
+        values[codes < 0] = NAT
+        result = pd.Series(values, index=series.index, name=series.name)
+
+        failed = np.flatnonzero(np.isnat(parsed))
+        if not len(failed):
+            return result, []
+
+        bad_rows = np.isin(codes, failed)
+        return result, list(zip(series.index[bad_rows], series[bad_rows]))
+
+    def format(self, series, date_format=OUTPUT_DATE_FORMAT):
+        """
+        Format a datetime column as strings, formatting each distinct date once
+
+        Args:
+            series (pandas.Series): Datetime column
+            date_format (str): strftime format
+
+        Returns:
+            pandas.Series: Formatted dates, NaN where the date is missing
+        """
+        codes, uniques = pd.factorize(series)
+        formatted = self._lookup(
+            self._formatted, [(date_format, value) for value in uniques.to_numpy()],
+            lambda keys: [pd.Timestamp(value).strftime(fmt) for fmt, value in keys]
+        )
+
+        values = np.asarray(formatted, dtype=object)[codes] if len(formatted) else np.empty(len(codes), dtype=object)
+        values[codes < 0] = np.nan
+        return pd.Series(values, index=series.index, name=series.name)
+
+    def clear(self):
+        """Forget every memoized value"""
+        with self._lock:
+            self._parsed.clear()
+            self._formatted.clear()
+
+    def _lookup(self, memo, keys, compute):
+        """Return memoized results for keys, computing the missing ones in one batch"""
+        with self._lock:
+            known = {key: memo[key] for key in keys if key in memo}
+
+        missing = [key for key in keys if key not in known]
+        if missing:
+            computed = dict(zip(missing, compute(missing)))
+            known.update(computed)
+            with self._lock:
+                if len(memo) + len(computed) > MAX_MEMO_SIZE:
+                    memo.clear()
+                memo.update(computed)
+
+        return [known[key] for key in keys]
+
+    def _parse_values(self, values):
+        """Parse distinct strings with the known formats first, then per-value inference"""
+        values = pd.Index(values, dtype=object)
+        parsed = np.full(len(values), NAT)
+        remaining = np.ones(len(values), dtype=bool)
+
+        for date_format in self.formats:
+            if not remaining.any():
+                break
+            attempt = pd.to_datetime(values[remaining], format=date_format, errors='coerce')
+            ok = ~np.isnat(attempt.to_numpy())
+            idx = np.flatnonzero(remaining)[ok]
+            parsed[idx] = attempt.to_numpy()[ok]
+            remaining[idx] = False
+
+        # Anything else pandas can make sense of on its own is still accepted. Inferring a
+        # format from a single value warns every time, which says nothing useful here
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            for idx in np.flatnonzero(remaining):
+                try:
+                    timestamp = pd.Timestamp(pd.to_datetime(values[idx]))
+                except (ValueError, TypeError, OverflowError):
+                    continue
+                if timestamp.tzinfo is not None:
+                    # Keep the local wall time, which is all the short date shows
+                    timestamp = timestamp.tz_localize(None)
+                parsed[idx] = timestamp.to_datetime64()
+
+        return list(parsed)
+
+def describe_unparsed_dates(unparsed, limit=10):
+    """
+    Describe rows with unparseable dates for a warning message
+
+    Args:
+        unparsed (list): (row label, value) pairs from DateNormalizer.parse
+        limit (int): Rows listed before the rest are summarized
+
+    Returns:
+        str: e.g. "row 3 ('Janury 5, 2025'), row 9 ('TBD')"
+    """
+    described = ', '.join(f"row {idx + 1} ({value!r})" for idx, value in unparsed[:limit])
+    if len(unparsed) > limit:
+        described += f" and {len(unparsed) - limit} more"
+    return described
+
+# Process-wide normalizer shared by all conversions
+default_normalizer = DateNormalizer()
@@ -0,0 +1,154 @@
+import io
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Tuple
+
+# WordprocessingML namespace, in ElementTree's {uri}tag form
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+BODY, TBL, TR, TC, P, R, HYPERLINK = (W + tag for tag in ('body', 'tbl', 'tr', 'tc', 'p', 'r', 'hyperlink'))
+
+# Run children that carry text, mapped to their text the way python-docx does
+RUN_TEXT = {
+    W + 't': None,  # the element's own text
+    W + 'tab': '\t',
+    W + 'ptab': '\t',
+    W + 'cr': '\n',
+    W + 'noBreakHyphen': '-',
+    W + 'br': None,  # '\n' for line breaks, '' for page and column breaks
+}
+
+# Cell holding only a question number, e.g. "12" or "12."
+QUESTION_NUMBER = re.compile(r'(\d+)\.?\s*$')
+ANSWER_LETTER = re.compile(r'^[A-Da-d]$')
+
+def iter_table_rows(file_bytes) -> Iterator[List[str]]:
+    """Yield the cell texts of every row of the top-level tables in a .docx file.
+
+    word/document.xml is parsed incrementally and each row is freed once it has
+    been read, so memory stays flat however long the document is. Cell texts
+    match python-docx's ``[cell.text for cell in row.cells]``, including the
+    repetition of horizontally and vertically merged cells.
+    """
+    with zipfile.ZipFile(io.BytesIO(file_bytes)) as archive:
+        with archive.open('word/document.xml') as document:
+            yield from _iter_rows(document)
+
+def _iter_rows(document) -> Iterator[List[str]]:
+    path = []
+    body = None
+    previous_row = None
+
+    for event, element in ET.iterparse(document, events=('start', 'end')):
+        if event == 'start':
+            path.append(element.tag)
+            if element.tag == BODY and len(path) == 2:
+                body = element
+            elif element.tag == TBL and len(path) == 3 and path[1] == BODY:
+                # Vertical merges only refer to rows of the same table
+                previous_row = None
+            continue
+
+        path.pop()
+
+        # A row of a table directly under the body (nested tables are skipped, as in python-docx)
+        if element.tag == TR and len(path) == 3 and path[1] == BODY and path[2] == TBL:
+            texts, previous_row = _read_row(element, previous_row)
+            yield texts
+            element.clear()
+
+        # Drop finished top-level blocks so the tree never grows with the document
+        elif body is not None and len(path) == 2 and path[1] == BODY:
+            body.remove(element)
+
+def _read_row(tr, previous_row) -> Tuple[List[str], Tuple[int, list]]:
+    """Return the cell texts of a row and its layout, which the next row needs to resolve vertical merges.
+
+    The layout is (grid_before, [(grid_span, repeat, text), ...]) with one entry per w:tc.
+    """
+    grid_before = _int_val(tr.find(f'{W}trPr/{W}gridBefore'), 0)
+    cells = []
+    texts = []
+    offset = grid_before
+
+    for tc in tr.findall(TC):
+        grid_span = _int_val(tc.find(f'{W}tcPr/{W}gridSpan'), 1)
+        v_merge = tc.find(f'{W}tcPr/{W}vMerge')
+
+        if v_merge is not None and v_merge.get(W + 'val', 'continue') == 'continue':
+            # Continuation of a vertical merge repeats the cell above
+            repeat, text = _cell_above(previous_row, offset)
+        else:
+            repeat, text = grid_span, '\n'.join(_paragraph_text(p) for p in tc.findall(P))
+
+        cells.append((grid_span, repeat, text))
+        texts.extend([text] * repeat)
+        offset += grid_span
+
+    return texts, (grid_before, cells)
+
+def _cell_above(previous_row, grid_offset) -> Tuple[int, str]:
+    """Find the cell starting at grid_offset in the previous row, as python-docx's tc_at_grid_offset does"""
+    if previous_row is None:
+        raise ValueError("no tr above topmost tr in w:tbl")
+
+    grid_before, cells = previous_row
+    remaining_offset = grid_offset - grid_before
+    for grid_span, repeat, text in cells:
+        if remaining_offset < 0:
+            break
+        if remaining_offset == 0:
+            return repeat, text
+        remaining_offset -= grid_span
+
+    raise ValueError(f"no `tc` element at grid_offset={grid_offset}")
+
+def _paragraph_text(p) -> str:
+    """Text of the runs and hyperlinks directly inside a paragraph"""
+    parts = []
+    for child in p:
+        if child.tag == R:
+            parts.append(_run_text(child))
+        elif child.tag == HYPERLINK:
+            parts.extend(_run_text(r) for r in child.findall(R))
+    return ''.join(parts)
+
+def _run_text(r) -> str:
+    parts = []
+    for child in r:
+        if child.tag not in RUN_TEXT:
+            continue
+        if child.tag == W + 't':
+            parts.append(child.text or '')
+        elif child.tag == W + 'br':
+            parts.append('\n' if child.get(W + 'type', 'textWrapping') == 'textWrapping' else '')
+        else:
+            parts.append(RUN_TEXT[child.tag])
+    return ''.join(parts)
+
+def _int_val(element, default) -> int:
+    if element is None:
+        return default
+    return int(element.get(W + 'val', default))
+
+def iter_answer_pairs(file_bytes) -> Iterator[Tuple[str, str]]:
+    """Yield (question number, answer letter) pairs from the answer key tables of a .docx file.
+
+    A pair is a cell holding only a question number followed by a cell holding a
+    single letter A-D.
+    """
+    for row in iter_table_rows(file_bytes):
+        row_text = [text.strip() for text in row]
+
+        # Skip empty rows
+        if not any(row_text):
+            continue
+
+        for i, cell_text in enumerate(row_text):
+            match = QUESTION_NUMBER.match(cell_text)
+            if match and i + 1 < len(row_text):
+                # Look at the next cell for the answer
+                answer = row_text[i + 1]
+                if answer and ANSWER_LETTER.match(answer):
+                    yield match.group(1), answer
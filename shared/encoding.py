@@ -0,0 +1,131 @@
+import codecs
+
+from chardet.universaldetector import UniversalDetector
+
+from shared.cache import default_cache, fingerprint
+
+# Bytes inspected to detect an encoding, however large the file is
+SAMPLE_SIZE = 64 * 1024
+# Bytes decoded per step when decoding the whole file
+DECODE_CHUNK_SIZE = 1024 * 1024
+# Minimum chardet confidence before its guess is trusted over the fallback
+MIN_CONFIDENCE = 0.5
+# Used when nothing else fits; cp1252 is a superset of latin-1 for printable text
+FALLBACK_ENCODINGS = ['cp1252', 'latin-1']
+
+# Checked in order: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+def detect_encoding(data, upload_hash=None):
+    """
+    Detect the text encoding of an upload from a bounded sample of its bytes
+
+    Byte order marks are checked first, then BOM-less UTF-16, then strict UTF-8,
+    and finally chardet's incremental detector is fed the sample. Only the first
+    SAMPLE_SIZE bytes are examined, so the cost does not grow with the file.
+
+    Args:
+        data (bytes | memoryview): Raw file contents
+        upload_hash (str): Content hash of the upload; when given, the result is cached under it
+
+    Returns:
+        str: Python codec name
+    """
+    if upload_hash is None:
+        return _detect_sample(data)
+    return default_cache.get_or_compute(fingerprint('encoding', upload_hash), lambda: _detect_sample(data))
+
+def _detect_sample(data):
+    sample = bytes(data[:SAMPLE_SIZE])
+    is_complete = len(data) <= SAMPLE_SIZE
+
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    utf16 = _guess_bomless_utf16(sample)
+    if utf16:
+        return utf16
+
+    # A strict UTF-8 decode of the sample rejects almost all other encodings
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=is_complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    detector = UniversalDetector()
+    detector.feed(sample)
+    detector.close()
+    result = detector.result
+    if result['encoding'] and result['confidence'] >= MIN_CONFIDENCE:
+        try:
+            return codecs.lookup(result['encoding']).name
+        except LookupError:
+            pass
+
+    return FALLBACK_ENCODINGS[0]
+
+def _guess_bomless_utf16(sample):
+    """Recognise UTF-16 without a BOM from the NUL bytes of mostly-ASCII text"""
+    if len(sample) < 4:
+        return None
+
+    even_nuls = sample[0::2].count(0)
+    odd_nuls = sample[1::2].count(0)
+    half = len(sample) // 2
+
+    if odd_nuls > half * 0.3 and even_nuls < half * 0.05:
+        return 'utf-16-le'
+    if even_nuls > half * 0.3 and odd_nuls < half * 0.05:
+        return 'utf-16-be'
+    return None
+
+def iter_decode(data, encoding, chunk_size=DECODE_CHUNK_SIZE):
+    """
+    Decode bytes lazily, yielding text one chunk at a time
+
+    Args:
+        data (bytes | memoryview): Raw file contents
+        encoding (str): Codec to decode with
+        chunk_size (int): Bytes decoded per step
+
+    Yields:
+        str: Decoded text chunks
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    view = memoryview(data)
+    for start in range(0, len(view), chunk_size):
+        text = decoder.decode(view[start:start + chunk_size])
+        if text:
+            yield text
+
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+def decode_text(data, encoding):
+    """
+    Decode a whole upload, falling back to single-byte encodings if the detected one fails later in the file
+
+    Args:
+        data (bytes | memoryview): Raw file contents
+        encoding (str): Detected codec
+
+    Returns:
+        tuple: (str, str) the decoded text and the encoding actually used
+    """
+    # latin-1 maps every byte, so the last candidate always succeeds
+    candidates = [encoding] + [e for e in FALLBACK_ENCODINGS if e != encoding]
+    for candidate in candidates[:-1]:
+        try:
+            return ''.join(iter_decode(data, candidate)), candidate
+        except UnicodeDecodeError:
+            continue
+    return ''.join(iter_decode(data, candidates[-1])), candidates[-1]
@@ -0,0 +1,97 @@
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from shared.cache import fingerprint
+from shared.instrumentation import timed
+
+# Schema metadata key the handoff details are stored under
+HANDOFF_METADATA_KEY = b'exam_converter.handoff'
+HANDOFF_FORMAT = 'exam-questions'
+HANDOFF_VERSION = 1
+
+@timed('export', 'parquet handoff')
+def to_parquet_bytes(df, validated=False, message=None):
+    """
+    Serialize parsed exam questions to Parquet, recording validation in the file metadata
+
+    Column types are kept as they are, so the next step reads the frame back
+    without re-parsing text or re-inferring dtypes.
+
+    Args:
+        df (pandas.DataFrame): Parsed questions
+        validated (bool): Whether df passed validate_raw_csv
+        message (str): Validation message to carry along
+
+    Returns:
+        bytes: Parquet file contents
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    handoff = {
+        'format': HANDOFF_FORMAT,
+        'version': HANDOFF_VERSION,
+        'validated': bool(validated),
+        'message': message,
+        'fingerprint': fingerprint(df.reset_index(drop=True)),
+    }
+    metadata = dict(table.schema.metadata or {})
+    metadata[HANDOFF_METADATA_KEY] = json.dumps(handoff).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
+
+@timed('read', 'parquet handoff')
+def read_parquet_handoff(data):
+    """
+    Read a Parquet handoff file
+
+    Args:
+        data (bytes): Parquet file contents
+
+    Returns:
+        tuple: (pandas.DataFrame, dict) the questions and the handoff details, empty if the file has none
+    """
+    table = pq.read_table(pa.BufferReader(data))
+    raw = (table.schema.metadata or {}).get(HANDOFF_METADATA_KEY)
+    handoff = json.loads(raw) if raw else {}
+    return blanks_to_missing(table.to_pandas()), handoff
+
+def blanks_to_missing(df):
+    """
+    Treat empty text cells as missing, as reading the same data back from a CSV export does
+
+    The parser stores absent choices and answers as '', which validate_raw_csv
+    only catches once they are missing values.
+
+    Args:
+        df (pandas.DataFrame): Parsed or handed-off questions
+
+    Returns:
+        pandas.DataFrame: Copy with '' replaced by NaN
+    """
+    return df.where(df.ne(''))
+
+def is_prevalidated(df, handoff):
+    """
+    Check whether validation recorded in a handoff still applies to the frame read from it
+
+    The recorded fingerprint must match the data, so a file edited after step 1
+    is validated again.
+
+    Args:
+        df (pandas.DataFrame): Frame read from the handoff file
+        handoff (dict): Handoff details from read_parquet_handoff
+
+    Returns:
+        bool: True if validation can be skipped
+    """
+    return (
+        handoff.get('format') == HANDOFF_FORMAT
+        and handoff.get('version') == HANDOFF_VERSION
+        and handoff.get('validated') is True
+        and handoff.get('fingerprint') == fingerprint(df)
+    )
@@ -0,0 +1,157 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+
+# Set CONVERTER_TIMINGS=1 to record stage timings; when unset, spans do nothing
+ENABLED = os.environ.get('CONVERTER_TIMINGS', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Pipeline stages spans are grouped under
+STAGES = ('read', 'decode', 'parse', 'validate', 'transform', 'export')
+
+logger = logging.getLogger('converter.timings')
+if ENABLED and not logger.handlers:
+    # Structured timing lines go to stderr unless the host application configures logging
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+
+# Spans recorded during the current Streamlit script run, if one has been started
+_run_spans = contextvars.ContextVar('run_spans', default=None)
+
+class Span:
+    """Timing of one stage, with optional row and byte counts"""
+
+    __slots__ = ('stage', 'name', 'rows', 'bytes', 'duration', '_start')
+
+    def __init__(self, stage, name=None, rows=None, bytes=None):
+        self.stage = stage
+        self.name = name or stage
+        self.rows = rows
+        self.bytes = bytes
+        self.duration = None
+        self._start = None
+
+    def set(self, rows=None, bytes=None):
+        """Record row and byte counts once they are known"""
+        if rows is not None:
+            self.rows = rows
+        if bytes is not None:
+            self.bytes = bytes
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        _record(self, failed=exc_type is not None)
+        return False
+
+    def as_dict(self):
+        return {
+            'stage': self.stage,
+            'name': self.name,
+            'duration_ms': round(self.duration * 1000, 3),
+            'rows': self.rows,
+            'bytes': self.bytes,
+        }
+
+class _NullSpan:
+    """Stand-in returned when instrumentation is off"""
+
+    __slots__ = ()
+
+    def set(self, rows=None, bytes=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(stage, name=None, rows=None, bytes=None):
+    """
+    Time a block of code as one stage
+
+        with span('parse', 'exam questions') as s:
+            df = parser.process_file(content)
+            s.set(rows=len(df))
+
+    Args:
+        stage (str): One of STAGES
+        name (str): What is being timed, defaults to the stage
+        rows (int): Rows handled, if known up front
+        bytes (int): Bytes handled, if known up front
+
+    Returns:
+        Span: Context manager; a shared no-op object when instrumentation is off
+    """
+    if not ENABLED:
+        return _NULL_SPAN
+    return Span(stage, name, rows, bytes)
+
+def timed(stage, name=None, rows=None):
+    """
+    Decorator timing every call of a function as one stage
+
+    Args:
+        stage (str): One of STAGES
+        name (str): What is being timed, defaults to the function name
+        rows (callable): Called with the function's result to count its rows
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            with Span(stage, span_name) as s:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    s.set(rows=rows(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+def _record(s, failed=False):
+    fields = s.as_dict()
+    if failed:
+        fields['failed'] = True
+    logger.info(json.dumps(fields), extra={'timing': fields})
+
+    spans = _run_spans.get()
+    if spans is not None:
+        spans.append(fields)
+
+def begin_run():
+    """Start collecting the spans of a new script run for the timing panel"""
+    if ENABLED:
+        _run_spans.set([])
+
+def run_spans():
+    """Spans recorded so far in the current script run"""
+    return list(_run_spans.get() or [])
+
+def show_timing_panel():
+    """Show the current run's stage timings in the sidebar, when instrumentation is on"""
+    spans = run_spans()
+    if not spans:
+        return
+
+    # Imported here so importing this module does not load Streamlit or pandas at startup
+    import pandas as pd
+    import streamlit as st
+
+    with st.sidebar.expander("⏱️ Stage timings"):
+        st.dataframe(pd.DataFrame(spans)[['stage', 'name', 'duration_ms', 'rows', 'bytes']], hide_index=True)
+        st.caption(f"Total {sum(s['duration_ms'] for s in spans):,.1f} ms across {len(spans)} spans")
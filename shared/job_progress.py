@@ -0,0 +1,65 @@
+import streamlit as st
+
+from shared.jobs import default_jobs, FINISHED_STATES
+
+# Seconds between progress checks while a job is running
+JOB_POLL_SECONDS = 1
+
+def submit_once(kind, files, **options):
+    """
+    Submit a job the first time this session asks for it
+
+    Reruns with the same upload reuse the job's ID instead of submitting
+    again, so a job that failed is not restarted on every rerun.
+
+    Args:
+        kind (str): Job kind, a key of JOB_KINDS
+        files (list): (name, bytes) pairs the job works on
+        **options: Options passed through to the job function
+
+    Returns:
+        str: Job ID
+    """
+    job_id = default_jobs.job_id(kind, files, **options)
+    submitted = st.session_state.setdefault('submitted_jobs', set())
+    if job_id not in submitted:
+        default_jobs.submit(kind, files, **options)
+        submitted.add(job_id)
+    return job_id
+
+def attach_job(query_param, job_id=None):
+    """
+    Status of the job shown by an app, reattaching through the URL
+
+    The job's ID is kept in a query parameter, so reruns and page refreshes
+    find it again after the upload that started it is gone.
+
+    Args:
+        query_param (str): URL query parameter holding the job ID
+        job_id (str): Newly submitted job to show instead of the one in the URL
+
+    Returns:
+        dict: Job status record, or None if there is no known job to show
+    """
+    if job_id:
+        st.query_params[query_param] = job_id
+
+    job_id = st.query_params.get(query_param)
+    if not job_id:
+        return None
+
+    status = default_jobs.status(job_id)
+    if status is None:
+        del st.query_params[query_param]
+    return status
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_job_progress(job_id, waiting_message="Processing..."):
+    """Poll a running job, rerunning the whole app once it finishes to show the results"""
+    status = default_jobs.status(job_id)
+    if status is None or status['state'] in FINISHED_STATES:
+        st.rerun()
+
+    done, total = status['done'], status['total']
+    st.progress(done / total if total else 0.0)
+    st.text(status['message'] or waiting_message)
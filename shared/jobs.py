@@ -0,0 +1,320 @@
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from shared.archive import SpooledZipWriter
+from shared.batch import convert_question_files
+from shared.cache import fingerprint
+from shared.encoding import decode_text, detect_encoding
+from shared.parser import CHOICE_COLUMNS, ExamParser
+from shared.question_utils import converted_filename
+
+# Directory holding one subdirectory of status and artifacts per job
+JOB_DIR = os.environ.get('CONVERTER_JOB_DIR') or os.path.join(tempfile.gettempdir(), 'converter_jobs')
+# Jobs run at the same time; the question batch job fans out to its own process pool
+JOB_WORKERS = int(os.environ.get('CONVERTER_JOB_WORKERS', '2'))
+# Finished jobs older than this are deleted when new jobs are submitted
+JOB_TTL_HOURS = float(os.environ.get('CONVERTER_JOB_TTL_HOURS', '24'))
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+FINISHED_STATES = (DONE, FAILED)
+
+STATUS_NAME = 'status.json'
+
+# Artifacts holding the frames the CSV to XLSX and Exam Quiz Converters show once a job is done
+PROCESSED_REPORT_ARTIFACT = 'processed_report.parquet'
+EXAM_QUESTIONS_ARTIFACT = 'exam_questions.parquet'
+
+# Job IDs arrive from the URL, so only well-formed fingerprints are turned into paths
+_JOB_ID_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+def _atomic_write(path, write):
+    """Write a file through a temporary file in the same directory, so readers never see it half written"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class JobStore:
+    """
+    Job status and artifacts on local disk, one directory per job
+
+    Status lives in a small JSON file that is replaced atomically on every
+    update, so any script run can read a job's progress while a worker thread
+    is writing it.
+    """
+
+    def __init__(self, root=JOB_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def job_dir(self, job_id):
+        if not _JOB_ID_PATTERN.fullmatch(job_id or ''):
+            raise ValueError(f"Invalid job ID: {job_id!r}")
+        return os.path.join(self.root, job_id)
+
+    def create(self, job_id, kind):
+        """Start a fresh status record for a job, dropping artifacts from any earlier attempt"""
+        path = self.job_dir(job_id)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+        now = time.time()
+        status = {
+            'id': job_id,
+            'kind': kind,
+            'state': QUEUED,
+            'done': 0,
+            'total': None,
+            'message': None,
+            'result': None,
+            'artifacts': [],
+            'created': now,
+            'updated': now,
+        }
+        self._write_status(job_id, status)
+        return status
+
+    def status(self, job_id):
+        """Return a job's status record, or None if the job is unknown or the ID is malformed"""
+        if not _JOB_ID_PATTERN.fullmatch(job_id or ''):
+            return None
+        try:
+            with open(os.path.join(self.job_dir(job_id), STATUS_NAME), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def update(self, job_id, **fields):
+        """Merge fields into a job's status record"""
+        with self._lock:
+            status = self.status(job_id)
+            if status is None:
+                return None
+            status.update(fields, updated=time.time())
+            self._write_status(job_id, status)
+            return status
+
+    def write_artifact(self, job_id, name, source):
+        """
+        Store an output file of a job
+
+        Args:
+            job_id (str): Job the artifact belongs to
+            name (str): File name of the artifact
+            source (bytes or file): Contents, or a file object to copy from
+        """
+        path = os.path.join(self.job_dir(job_id), os.path.basename(name))
+        if isinstance(source, (bytes, bytearray)):
+            _atomic_write(path, lambda f: f.write(source))
+        else:
+            _atomic_write(path, lambda f: shutil.copyfileobj(source, f))
+
+        with self._lock:
+            status = self.status(job_id)
+            if name not in status['artifacts']:
+                status['artifacts'].append(name)
+                self._write_status(job_id, status)
+
+    def read_artifact(self, job_id, name):
+        """Return the bytes of a stored artifact"""
+        with open(os.path.join(self.job_dir(job_id), os.path.basename(name)), 'rb') as f:
+            return f.read()
+
+    def prune(self, max_age_hours=JOB_TTL_HOURS):
+        """Delete finished jobs last updated more than max_age_hours ago"""
+        cutoff = time.time() - max_age_hours * 3600
+        for job_id in os.listdir(self.root):
+            if not _JOB_ID_PATTERN.fullmatch(job_id):
+                continue
+            status = self.status(job_id)
+            if status is not None and status['state'] in FINISHED_STATES and status['updated'] < cutoff:
+                shutil.rmtree(os.path.join(self.root, job_id), ignore_errors=True)
+
+    def _write_status(self, job_id, status):
+        data = json.dumps(status).encode('utf-8')
+        _atomic_write(os.path.join(self.job_dir(job_id), STATUS_NAME), lambda f: f.write(data))
+
+class JobContext:
+    """Handle a running job uses to report progress and store its outputs"""
+
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+
+    def progress(self, done, total, message=None):
+        self.store.update(self.job_id, done=done, total=total, message=message)
+
+    def artifact(self, name, source):
+        self.store.write_artifact(self.job_id, name, source)
+
+class JobQueue:
+    """
+    Runs conversion jobs on background threads, independent of any script run
+
+    A job's ID is a fingerprint of its kind, input files and options. Submitting
+    the same work again while it is running or after it finished returns the
+    existing job instead of starting it over, so a rerun or page refresh can
+    reattach to it by ID.
+    """
+
+    def __init__(self, store, kinds, max_workers=JOB_WORKERS):
+        self.store = store
+        self.kinds = kinds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='converter-job')
+        self._futures = {}
+        # Reentrant, since submit checks the status of an existing job while holding it
+        self._lock = threading.RLock()
+
+    def submit(self, kind, files, **options):
+        """
+        Queue a job, or return the ID of an identical one that is running or done
+
+        Args:
+            kind (str): Job kind, a key of the queue's kinds
+            files (list): (name, bytes) pairs the job works on
+            **options: Options passed through to the job function
+
+        Returns:
+            str: Job ID
+        """
+        if kind not in self.kinds:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        files = list(files)
+        job_id = self.job_id(kind, files, **options)
+
+        with self._lock:
+            status = self.status(job_id)
+            if status is not None and status['state'] != FAILED:
+                return job_id
+
+            self.store.prune()
+            self.store.create(job_id, kind)
+            self._futures[job_id] = self._executor.submit(self._run, job_id, kind, files, options)
+        return job_id
+
+    def job_id(self, kind, files, **options):
+        """ID a job for this work has, whether or not it was submitted"""
+        parts = [part for name, data in files for part in (name, data)]
+        return fingerprint('job', kind, options, *parts)
+
+    def status(self, job_id):
+        """
+        Current status of a job
+
+        Jobs left queued or running by an earlier server process can no longer
+        finish, so they are reported as failed.
+
+        Returns:
+            dict: Status record, or None if the job is unknown
+        """
+        with self._lock:
+            status = self.store.status(job_id)
+            if status is not None and status['state'] not in FINISHED_STATES and job_id not in self._futures:
+                status = self.store.update(job_id, state=FAILED, message="Interrupted by a server restart")
+        return status
+
+    def read_artifact(self, job_id, name):
+        return self.store.read_artifact(job_id, name)
+
+    def read_frame(self, job_id, name):
+        """Read a dataframe stored as a Parquet artifact"""
+        return pd.read_parquet(io.BytesIO(self.read_artifact(job_id, name)))
+
+    def _run(self, job_id, kind, files, options):
+        self.store.update(job_id, state=RUNNING)
+        try:
+            result = self.kinds[kind](JobContext(self.store, job_id), files, **options)
+        except Exception as e:
+            self.store.update(job_id, state=FAILED, message=str(e))
+        else:
+            self.store.update(job_id, state=DONE, result=result)
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+
+def run_question_files(job, files, category, include_ids=True):
+    """Convert raw questions files into import files, collected in a ZIP artifact"""
+    archive = SpooledZipWriter()
+
+    def on_progress(done, total, result):
+        if result['status'] == 'success':
+            archive.add_dataframe(converted_filename(result['name']), result['df'])
+            # The frame is no longer needed once it is in the archive
+            result['df'] = None
+        job.progress(done, total, f"Processed file {done}/{total}: {result['name']}")
+
+    try:
+        results = convert_question_files(files, category=category, include_ids=include_ids, on_progress=on_progress)
+        with archive.finish() as zip_file:
+            if archive.count:
+                job.artifact('converted_files.zip', zip_file)
+    except BaseException:
+        archive.discard()
+        raise
+
+    return {
+        'files': [{'name': r['name'], 'status': r['status'], 'message': r['message']} for r in results],
+    }
+
+def run_cfp_report(job, files):
+    """Read and map a CFP credit report, storing the processed rows as a Parquet artifact"""
+    # utils lives at the repository root and imports from shared, so it is loaded on use
+    from utils import process_file, read_report
+
+    (name, data), = files
+    job.progress(0, 1, f"Processing {name}")
+    df_processed = process_file(read_report(data))
+    job.artifact(PROCESSED_REPORT_ARTIFACT, df_processed.to_parquet(index=False))
+    job.progress(1, 1, f"Processed {name}")
+
+    return {
+        'rows': len(df_processed),
+        # (row, value) pairs, kept as lists so they survive the JSON status file
+        'unparsed_dates': [[int(idx), str(value)] for idx, value in df_processed.attrs.get('unparsed_dates', [])],
+    }
+
+def run_exam(job, files, answer_key_content=None):
+    """Parse an exam text file, storing the questions as a Parquet artifact"""
+    (name, data), = files
+    job.progress(0, 1, f"Parsing {name}")
+    content, encoding = decode_text(data, detect_encoding(data))
+    df = ExamParser().process_file(content, answer_key_content)
+    job.artifact(EXAM_QUESTIONS_ARTIFACT, df.to_parquet(index=False))
+    job.progress(1, 1, f"Parsed {name}")
+
+    # The parser leaves an absent choice or unresolved answer as '' rather than missing
+    return {
+        'questions': len(df),
+        'encoding': encoding,
+        'missing_choices': int(df[CHOICE_COLUMNS].eq('').any(axis=1).sum()),
+        'missing_correct': int(df['Correct Answer'].eq('').sum()),
+    }
+
+# Job kind -> function called as func(job, files, **options) on a worker thread
+JOB_KINDS = {
+    'question_files': run_question_files,
+    'cfp_report': run_cfp_report,
+    'exam': run_exam,
+}
+
+# Process-wide queue, shared by every session so jobs outlive the script run that started them
+default_jobs = JobQueue(JobStore(JOB_DIR), JOB_KINDS)
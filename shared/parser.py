@@ -1,14 +1,53 @@
+import logging
 import re
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple
+from shared.cache import default_cache, fingerprint
+from shared.instrumentation import timed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Raw question record: (number, question text, answer choices, asterisk-marked answer text)
+QuestionRecord = Tuple[str, str, Dict[str, str], str]
+
+CHOICE_LETTERS = ('A', 'B', 'C', 'D')
+CHOICE_COLUMNS = [f'answer choice {letter}' for letter in CHOICE_LETTERS]
+# Columns of the raw questions format the parser produces and the Question Converter reads
+RAW_COLUMNS = ['Question'] + CHOICE_COLUMNS + ['Correct Answer']
+# Parsed structure of a question file, before any answer key is applied
+STRUCTURE_COLUMNS = ['Number', 'Question'] + CHOICE_COLUMNS + ['Marked Answer']
+
+logger = logging.getLogger(__name__)
 
 class ExamParser:
-    def __init__(self):
+    # 'regex' is the original split-and-match parser, 'tokenizer' the single-pass line parser
+    ENGINES = ('regex', 'tokenizer')
+
+    # Line starts recognised by the tokenizer engine
+    _question_start = re.compile(r'(\d+)\.')
+    _choice_start = re.compile(r'[A-Da-d]\.')
+
+    # Answer key entries written as "1: C" anywhere, or as "1. C" on a line of its own so that
+    # numbered sentences such as "2. A trust is ..." are not read as answers
+    _answer_key_re = re.compile(
+        r'(\d+)\s*:\s*([A-Da-d])|^[ \t]*(\d+)\.[ \t]*([A-Da-d])[.)]?[ \t\r]*$',
+        re.MULTILINE
+    )
+
+    def __init__(self, engine: str = 'tokenizer'):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown parser engine '{engine}', expected one of: {', '.join(self.ENGINES)}")
+        self.engine = engine
+
         # Updated pattern to fix invalid escape sequence and handle company names with Inc., Ltd., etc.
         self.question_pattern = r'(\d+)\.\s*(.*?)(?=\s*(?:\n[A-Da-d]\.|\Z))'
         # Modified answer pattern to be more strict about answer format and fix escape sequence
         self.answer_pattern = r'(?:^|\n)\s*([A-Da-d])\.\s*(.*?)(?=\s*(?:\n[A-Da-d]\.|\Z|\n\d+\.|\Z))'
 
+        # Compile once instead of going through the re module cache on every call
+        self._question_re = re.compile(self.question_pattern, re.DOTALL | re.MULTILINE)
+        self._answer_re = re.compile(self.answer_pattern, re.DOTALL | re.MULTILINE)
+        self._block_split_re = re.compile(r'\n(?=\d+\.)')
+
     def parse_answer_key(self, answer_key_content: str) -> Dict[str, str]:
         """Parse answer key content into a dictionary."""
         if not answer_key_content:
@@ -16,31 +55,83 @@ class ExamParser:
 
         answers = {}
 
-        # Simple pattern to match question number and answer letter
-        # This pattern looks for "number: letter" format
-        pattern = r'(\d+)\s*:\s*([A-Da-d])'
-
-        matches = re.finditer(pattern, answer_key_content, re.MULTILINE | re.IGNORECASE)
-        for match in matches:
-            question_num, answer_letter = match.groups()
-            # Clean up and store the answer
-            answers[question_num.strip()] = answer_letter.strip().upper()
+        for match in self._answer_key_re.finditer(answer_key_content):
+            colon_num, colon_letter, period_num, period_letter = match.groups()
+            answers[colon_num or period_num] = (colon_letter or period_letter).upper()
 
-        # Debug print
-        print("Found answers:", answers)
+        logger.debug("Found %d answers in answer key", len(answers))
 
         return answers
 
     def parse_content(self, content: str, answer_key_content: str = None) -> List[Dict]:
         """Parse exam content into structured format."""
-        content = content.replace('\r\n', '\n').replace('\r', '\n')
-        parsed_questions = []
+        return list(self.iter_questions(content, answer_key_content))
 
+    def iter_questions(self, content: str, answer_key_content: str = None) -> Iterator[Dict]:
+        """Parse exam content lazily, yielding one question dict at a time."""
         # Parse answer key if provided
         answer_key = self.parse_answer_key(answer_key_content) if answer_key_content else {}
 
+        for question_num, question_text, answers, correct_answer_text in self._records(content):
+            # Check answer key
+            if not correct_answer_text and question_num in answer_key:
+                correct_letter = answer_key[question_num]
+                if correct_letter in answers:
+                    correct_answer_text = answers[correct_letter]
+
+            question_dict = {
+                'Question': question_text,
+                'answer choice A': answers['A'],
+                'answer choice B': answers['B'],
+                'answer choice C': answers['C'],
+                'answer choice D': answers['D'],
+                'Correct Answer': correct_answer_text
+            }
+            yield question_dict
+
+    def parse_structure(self, content: str) -> pd.DataFrame:
+        """Parse question numbers, text, choices and asterisk-marked answers, without any answer key."""
+        rows = [
+            (question_num, question_text, *(answers[letter] for letter in CHOICE_LETTERS), marked_answer)
+            for question_num, question_text, answers, marked_answer in self._records(content)
+        ]
+        return pd.DataFrame(rows, columns=STRUCTURE_COLUMNS)
+
+    def structure(self, content: str) -> pd.DataFrame:
+        """Structure of a question file, parsed once per file and reused with any answer key."""
+        return default_cache.get_or_compute(
+            fingerprint('exam_structure', self.engine, content), lambda: self.parse_structure(content)
+        )
+
+    def apply_answer_key(self, structure: pd.DataFrame, answer_key: Dict[str, str]) -> pd.DataFrame:
+        """Fill in correct answers from an answer key with one join on question number.
+
+        An asterisk-marked answer takes precedence over the key, as in iter_questions.
+        """
+        correct = structure['Marked Answer'].to_numpy(dtype=object, copy=True)
+
+        if answer_key and len(structure):
+            choice_index = structure['Number'].map(answer_key).map({letter: i for i, letter in enumerate(CHOICE_LETTERS)})
+            rows = np.flatnonzero(choice_index.notna().to_numpy() & (correct == ''))
+            if len(rows):
+                choices = structure[CHOICE_COLUMNS].to_numpy(dtype=object)
+                correct[rows] = choices[rows, choice_index.to_numpy()[rows].astype(int)]
+
+        df = structure[RAW_COLUMNS[:-1]].copy()
+        df['Correct Answer'] = correct
+        return df
+
+    def _records(self, content: str) -> Iterator[QuestionRecord]:
+        """Raw question records from the selected engine."""
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+        if self.engine == 'tokenizer':
+            return self._tokenize(content)
+        return self._match_blocks(content)
+
+    def _match_blocks(self, content: str) -> Iterator[QuestionRecord]:
+        """Regex engine: split the document into question blocks and match each one."""
         # Split content into question blocks
-        questions_raw = re.split(r'\n(?=\d+\.)', content)
+        questions_raw = self._block_split_re.split(content)
 
         for question_block in questions_raw:
             try:
@@ -49,73 +140,120 @@ class ExamParser:
                     continue
 
                 # Match question
-                question_match = re.match(self.question_pattern, question_block, re.DOTALL | re.MULTILINE)
+                question_match = self._question_re.match(question_block)
                 if not question_match:
                     continue
 
                 question_num = question_match.group(1)
                 question_text = question_match.group(2).strip().strip('"')
 
-                # Skip if it's just a year
-                if question_text.isdigit():
-                    continue
-
-                # Initialize answers with empty strings
-                answers = {'A': '', 'B': '', 'C': '', 'D': ''}
-                correct_answer_text = ''
-
                 # Get the answer section after the question
                 answer_section = question_block[len(question_match.group(0)):].strip()
 
                 # Find all answer choices
-                answer_matches = list(re.finditer(self.answer_pattern, '\n' + answer_section, re.DOTALL | re.MULTILINE))
-
-                # Process each answer choice
-                for match in answer_matches:
-                    letter, text = match.groups()
-                    letter = letter.upper()
-                    text = text.strip().strip('"').strip()
-
-                    if text:  # Only store non-empty answers
-                        answers[letter] = text
-
-                        # Check for asterisk marking correct answer
-                        if '*' in text:
-                            correct_answer_text = text.replace('*', '').strip()
-                            answers[letter] = correct_answer_text
-
-                # Check answer key
-                if not correct_answer_text and question_num in answer_key:
-                    correct_letter = answer_key[question_num]
-                    if correct_letter in answers:
-                        correct_answer_text = answers[correct_letter]
-
-                # Only add if we have a question
-                if question_text:
-                    question_dict = {
-                        'Question': question_text,
-                        'answer choice A': answers['A'],
-                        'answer choice B': answers['B'],
-                        'answer choice C': answers['C'],
-                        'answer choice D': answers['D'],
-                        'Correct Answer': correct_answer_text
-                    }
-                    parsed_questions.append(question_dict)
+                choices = [match.groups() for match in self._answer_re.finditer('\n' + answer_section)]
+
+                record = self._build_record(question_num, question_text, choices)
+                if record:
+                    yield record
 
             except Exception as e:
-                print(f"Error parsing question: {str(e)}")
+                logger.warning("Error parsing question: %s", e)
                 continue
 
-        return parsed_questions
+    def _tokenize(self, content: str) -> Iterator[QuestionRecord]:
+        """Tokenizer engine: classify each line once and assemble records in a single pass.
+
+        A line starting with "N." opens a question and one starting with "A." to "D."
+        opens a choice. As with the regex engine, a choice line only ends the current
+        question or choice once that has some text; until then it is part of the text.
+        """
+        question_num = None
+        question_lines = []
+        has_text = False
+        choices = []
+
+        for line in content.split('\n'):
+            number_match = self._question_start.match(line)
+            if number_match:
+                if question_num is not None:
+                    record = self._finish_tokens(question_num, question_lines, choices)
+                    if record:
+                        yield record
+
+                question_num = number_match.group(1)
+                rest = line[number_match.end():]
+                question_lines = [rest]
+                has_text = bool(rest.strip())
+                choices = []
+                continue
+
+            # Text before the first numbered question is ignored
+            if question_num is None:
+                continue
+
+            if has_text and self._choice_start.match(line):
+                rest = line[2:]
+                choices.append((line[0], [rest]))
+                has_text = bool(rest.strip())
+                continue
+
+            # Continuation of the current question or choice
+            (choices[-1][1] if choices else question_lines).append(line)
+            has_text = has_text or bool(line.strip())
+
+        if question_num is not None:
+            record = self._finish_tokens(question_num, question_lines, choices)
+            if record:
+                yield record
+
+    def _finish_tokens(self, question_num: str, question_lines: List[str],
+                       choices: List[Tuple[str, List[str]]]) -> Optional[QuestionRecord]:
+        """Join the lines collected by the tokenizer for one question."""
+        question_text = '\n'.join(question_lines).strip().strip('"')
+        return self._build_record(
+            question_num,
+            question_text,
+            [(letter, '\n'.join(lines)) for letter, lines in choices]
+        )
+
+    def _build_record(self, question_num: str, question_text: str,
+                      choices: List[Tuple[str, str]]) -> Optional[QuestionRecord]:
+        """Apply the shared choice and asterisk rules, or return None if the block is not a question."""
+        # Skip if it's just a year
+        if question_text.isdigit():
+            return None
+
+        # Initialize answers with empty strings
+        answers = {'A': '', 'B': '', 'C': '', 'D': ''}
+        correct_answer_text = ''
+
+        # Process each answer choice
+        for letter, text in choices:
+            letter = letter.upper()
+            text = text.strip().strip('"').strip()
+
+            if text:  # Only store non-empty answers
+                answers[letter] = text
+
+                # Check for asterisk marking correct answer
+                if '*' in text:
+                    correct_answer_text = text.replace('*', '').strip()
+                    answers[letter] = correct_answer_text
+
+        # Only add if we have a question
+        if not question_text:
+            return None
+
+        return question_num, question_text, answers, correct_answer_text
 
     def create_dataframe(self, parsed_questions: List[Dict]) -> pd.DataFrame:
         """Convert parsed questions to pandas DataFrame."""
         if not parsed_questions:
-            return pd.DataFrame(columns=['Question', 'answer choice A', 'answer choice B', 
-                                      'answer choice C', 'answer choice D', 'Correct Answer'])
+            return pd.DataFrame(columns=RAW_COLUMNS)
         return pd.DataFrame(parsed_questions)
 
+    @timed('parse', 'exam questions', rows=len)
     def process_file(self, content: str, answer_key_content: str = None) -> pd.DataFrame:
-        """Process file content and return DataFrame."""
-        parsed_questions = self.parse_content(content, answer_key_content)
-        return self.create_dataframe(parsed_questions) 
\ No newline at end of file
+        """Process file content and return DataFrame, parsing each file once and joining the answer key on top."""
+        return self.apply_answer_key(self.structure(content), self.parse_answer_key(answer_key_content))
@@ -0,0 +1,110 @@
+import csv
+import io
+import os
+import random
+
+import pandas as pd
+
+from shared.instrumentation import timed
+from shared.parser import CHOICE_COLUMNS, RAW_COLUMNS, ExamParser
+from shared.question_utils import LEADING_NUMBER_PATTERN, describe_rows
+
+# Columns of the import format produced by the Question Converter
+IMPORT_COLUMNS = ['ID', 'Title', 'Category', 'Type', 'Post Content', 'Status', 'Menu Order', 'Options', 'Answer']
+
+def _is_empty(value):
+    return value is None or value == '' or (isinstance(value, float) and pd.isna(value))
+
+def write_import_csv(questions, output, category, include_ids=True):
+    """
+    Stream parsed questions straight into import-format CSV rows, validating each one as it passes
+
+    Applies the checks of validate_raw_csv and the mapping of transform_csv to
+    each question without building any intermediate dataframe. Once a row fails
+    validation nothing more is written, so the caller must discard the output
+    when validation fails.
+
+    Cell text is used exactly as parsed. Exporting the questions to CSV and
+    reading that file back (the two-step path through the Question Converter)
+    differs in two ways: cells that are a missing-value marker such as "NA" or
+    "None" become empty and fail validation, and columns whose cells are all
+    numbers are re-typed, so a choice written "2.50" is exported as "2.5".
+    Otherwise both paths give the same rows and messages.
+
+    Args:
+        questions (iterable): Question dicts as yielded by ExamParser.iter_questions
+        output (file): Text file the CSV is written to
+        category (str): Category value to use in the output
+        include_ids (bool): Whether to include ID values or leave them blank
+
+    Returns:
+        tuple: (bool, str, int) validation status, message and number of questions
+    """
+    # Starting ID (random but consistent within batch), drawn as transform_csv does
+    current_id = random.randint(100000, 999999) if include_ids else None
+
+    writer = csv.writer(output, lineterminator=os.linesep)
+    writer.writerow(IMPORT_COLUMNS)
+
+    empty_rows = []
+    mismatched_rows = []
+    count = 0
+    for row_number, question in enumerate(questions):
+        count = row_number + 1
+        if any(_is_empty(question[col]) for col in RAW_COLUMNS):
+            empty_rows.append(row_number)
+            continue
+
+        correct_answer = str(question['Correct Answer']).strip()
+        choices = [str(question[col]).strip() for col in CHOICE_COLUMNS]
+        if correct_answer not in choices:
+            mismatched_rows.append(row_number)
+            continue
+
+        if empty_rows or mismatched_rows:
+            continue
+
+        title = LEADING_NUMBER_PATTERN.sub('', str(question['Question']).strip())
+        writer.writerow([
+            current_id + row_number if include_ids else '',
+            title,
+            category,
+            'single-choice',
+            title,
+            'publish',
+            row_number + 1,
+            '|'.join(choices),
+            correct_answer
+        ])
+
+    # Same precedence as validate_raw_csv: empty cells are reported before mismatched answers
+    if empty_rows:
+        return False, f"Empty cells found in required columns ({describe_rows(empty_rows)})", count
+    if mismatched_rows:
+        return False, f"Correct answer doesn't match any choice in {describe_rows(mismatched_rows)}", count
+    return True, "Validation successful", count
+
+@timed('transform', 'fused exam to import')
+def exam_to_import_csv(content, category, answer_key_content=None, include_ids=True, engine='tokenizer'):
+    """
+    Convert exam text straight to the import CSV in one pass
+
+    Args:
+        content (str): Exam question text
+        category (str): Category value to use in the output
+        answer_key_content (str): Optional separate answer key text
+        include_ids (bool): Whether to include ID values or leave them blank
+        engine (str): ExamParser engine to parse with
+
+    Returns:
+        tuple: (bool, str, str) validation status, message and the CSV text (None if invalid)
+    """
+    questions = ExamParser(engine=engine).iter_questions(content, answer_key_content)
+    output = io.StringIO()
+    is_valid, message, count = write_import_csv(questions, output, category, include_ids)
+
+    if not count:
+        return False, "No questions found", None
+    if not is_valid:
+        return False, message, None
+    return True, message, output.getvalue()
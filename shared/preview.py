@@ -0,0 +1,73 @@
+import math
+
+import streamlit as st
+
+# Rows sent to the browser per page
+PAGE_SIZE = 50
+# Longer text cells are cut on the server before being sent
+MAX_CELL_CHARS = 200
+
+def truncate_cells(df, max_chars=MAX_CELL_CHARS):
+    """
+    Shorten long text cells for display
+
+    Args:
+        df (pandas.DataFrame): Rows to display; should already be a small window
+        max_chars (int): Longest text kept in full
+
+    Returns:
+        pandas.DataFrame: Copy with long strings cut and ending in an ellipsis
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object or df[col].dtype.name == 'category':
+            df[col] = df[col].astype(object).map(
+                lambda value: value[:max_chars - 1] + '…' if isinstance(value, str) and len(value) > max_chars else value
+            )
+    return df
+
+def preview_summary(df):
+    """
+    Summary statistics shown above a preview
+
+    Args:
+        df (pandas.DataFrame): Full frame being previewed
+
+    Returns:
+        str: Row and column counts plus the columns that have empty cells
+    """
+    summary = f"{len(df):,} rows × {len(df.columns)} columns"
+    missing = df.isna().sum()
+    missing = missing[missing > 0]
+    if not missing.empty:
+        summary += " · empty cells: " + ", ".join(f"{col} ({count:,})" for col, count in missing.items())
+    return summary
+
+@st.fragment
+def show_preview(df, key, page_size=PAGE_SIZE, max_chars=MAX_CELL_CHARS):
+    """
+    Show one page of a dataframe with summary statistics and a page selector
+
+    Only the current page, with long text truncated, is sent to the browser.
+    Runs as a fragment, so moving between pages reruns just the preview
+    rather than the whole app.
+
+    Args:
+        df (pandas.DataFrame): Full frame to preview
+        key (str): Unique widget key for this preview
+        page_size (int): Rows per page
+        max_chars (int): Longest text shown in full
+    """
+    st.caption(preview_summary(df))
+
+    pages = max(1, math.ceil(len(df) / page_size))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    window = df.iloc[start:start + page_size]
+    st.dataframe(truncate_cells(window, max_chars))
+
+    if pages > 1:
+        st.caption(f"Showing rows {start + 1:,}–{start + len(window):,} of {len(df):,}")
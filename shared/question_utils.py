@@ -1,7 +1,13 @@
 import pandas as pd
 import io
+import os
 import random
 import re
+from shared.cache import default_cache, fingerprint
+from shared.instrumentation import timed
+
+# Leading question number, e.g. "12. "
+LEADING_NUMBER_PATTERN = re.compile(r'^\d+\.\s*')
 
 def clean_question_text(text):
     """
@@ -14,9 +20,10 @@ def clean_question_text(text):
         str: Cleaned text without leading question number
     """
     # Remove leading digits followed by dot and whitespace
-    cleaned_text = re.sub(r'^\d+\.\s*', '', str(text).strip())
+    cleaned_text = LEADING_NUMBER_PATTERN.sub('', str(text).strip())
     return cleaned_text
 
+@timed('validate', 'raw questions')
 def validate_raw_csv(df):
     """
     Validate the raw CSV format and structure
@@ -49,23 +56,35 @@ def validate_raw_csv(df):
     # Check if there are any empty rows
     empty_cells = df[required_columns].isna().any(axis=1)
     if empty_cells.any():
-        first_empty_row = empty_cells[empty_cells].index[0] + 1
-        return False, f"Empty cells found in required columns (first occurrence at row {first_empty_row})"
-
-    # Validate that correct answers match one of the choices
-    for idx, row in df.iterrows():
-        correct_answer = str(row['Correct Answer']).strip()
-        choices = [
-            str(row['answer choice A']).strip(),
-            str(row['answer choice B']).strip(),
-            str(row['answer choice C']).strip(),
-            str(row['answer choice D']).strip()
-        ]
-        if correct_answer not in choices:
-            return False, f"Correct answer doesn't match any choice in row {idx + 1}"
+        return False, f"Empty cells found in required columns ({describe_rows(df.index[empty_cells])})"
+
+    # Validate that correct answers match one of the choices, comparing whole columns at once
+    correct_answer = df['Correct Answer'].astype(str).str.strip()
+    matches_choice = pd.Series(False, index=df.index)
+    for col in ['answer choice A', 'answer choice B', 'answer choice C', 'answer choice D']:
+        matches_choice |= df[col].astype(str).str.strip() == correct_answer
+
+    if not matches_choice.all():
+        return False, f"Correct answer doesn't match any choice in {describe_rows(df.index[~matches_choice])}"
 
     return True, "Validation successful"
 
+def describe_rows(index):
+    """
+    Describe the (1-based) rows of a failed check for a validation message
+
+    Args:
+        index (pandas.Index): Index labels of the offending rows
+
+    Returns:
+        str: "row N" for a single row, otherwise "rows N, M, ..."
+    """
+    rows = [str(idx + 1) for idx in index]
+    if len(rows) == 1:
+        return f"row {rows[0]}"
+    return f"rows {', '.join(rows)}"
+
+@timed('transform', 'questions to import format', rows=len)
 def transform_csv(df, category, include_ids=True):
     """
     Transform raw CSV to goal format
@@ -81,51 +100,66 @@ def transform_csv(df, category, include_ids=True):
     # Clean column names
     df.columns = df.columns.str.strip()
 
-    # Initialize empty lists for new data
-    records = []
+    # Reuse the result (including its IDs) when the same questions are converted again.
+    # The cache keeps the compact Parquet form, so no converted frame stays resident.
+    key = fingerprint('transform_csv', df, category, include_ids)
+    cached = default_cache.get(key)
+    if cached is not None:
+        return pd.read_parquet(io.BytesIO(cached))
+
+    goal_df = _build_goal_frame(df, category, include_ids)
+    default_cache.put(key, goal_df.to_parquet(index=False))
+    return goal_df
+
+def _build_goal_frame(df, category, include_ids):
+    """
+    Build the goal format dataframe from a raw questions dataframe with clean column names
 
+    Args:
+        df (pandas.DataFrame): Input dataframe to transform
+        category (str): Category value to use in the output
+        include_ids (bool): Whether to include ID values or leave them blank
+
+    Returns:
+        pandas.DataFrame: Transformed dataframe in goal format
+    """
     # Starting ID (random but consistent within batch)
     current_id = random.randint(100000, 999999) if include_ids else None
 
-    for idx, row in df.iterrows():
-        # Skip empty rows
-        if pd.isna(row['Question']):
-            continue
-
-        # Clean the question text to remove leading numbers
-        cleaned_question = clean_question_text(row['Question'])
-
-        # Combine all answer choices into pipe-separated string
-        options = "|".join([
-            str(row['answer choice A']).strip(),
-            str(row['answer choice B']).strip(),
-            str(row['answer choice C']).strip(),
-            str(row['answer choice D']).strip()
-        ])
-
-        # Create new record in goal format
-        record = {
-            'ID': '' if not include_ids else (current_id + idx),
-            'Title': cleaned_question,
-            'Category': category,
-            'Type': 'single-choice',
-            'Post Content': cleaned_question,
-            'Status': 'publish',
-            'Menu Order': idx + 1,
-            'Options': options,
-            'Answer': str(row['Correct Answer']).strip()
-        }
-
-        records.append(record)
+    # Skip empty rows
+    rows = df[df['Question'].notna()]
+    if rows.empty:
+        return pd.DataFrame()
+
+    # Clean the question text to remove leading numbers
+    cleaned_question = rows['Question'].astype(str).str.strip().str.replace(LEADING_NUMBER_PATTERN, '', regex=True)
+
+    # Combine all answer choices into pipe-separated string
+    options = rows['answer choice A'].astype(str).str.strip()
+    for col in ['answer choice B', 'answer choice C', 'answer choice D']:
+        options = options + '|' + rows[col].astype(str).str.strip()
+
+    # IDs and menu order follow the original row positions, so skipped rows leave gaps
+    row_numbers = rows.index.to_numpy()
 
     # Create new dataframe in goal format
-    goal_df = pd.DataFrame(records)
+    goal_df = pd.DataFrame({
+        'ID': current_id + row_numbers if include_ids else '',
+        'Title': cleaned_question.to_numpy(),
+        'Category': category,
+        'Type': 'single-choice',
+        'Post Content': cleaned_question.to_numpy(),
+        'Status': 'publish',
+        'Menu Order': row_numbers + 1,
+        'Options': options.to_numpy(),
+        'Answer': rows['Correct Answer'].astype(str).str.strip().to_numpy()
+    })
 
     return goal_df
 
 def get_csv_preview(df, num_rows=5):
     """
-    Get a preview of the dataframe as HTML
+    Get a preview of the dataframe as HTML, with long text truncated
 
     Args:
         df (pandas.DataFrame): Dataframe to preview
@@ -134,8 +168,12 @@ def get_csv_preview(df, num_rows=5):
     Returns:
         str: HTML representation of the dataframe preview
     """
-    return df.head(num_rows).to_html(index=False)
+    # Imported here so headless users of this module do not load Streamlit
+    from shared.preview import truncate_cells
 
+    return truncate_cells(df.head(num_rows)).to_html(index=False)
+
+@timed('export', 'import csv')
 def convert_df_to_csv(df):
     """
     Convert dataframe to CSV string
@@ -146,4 +184,19 @@ def convert_df_to_csv(df):
     Returns:
         str: CSV string representation of the dataframe
     """
-    return df.to_csv(index=False) 
\ No newline at end of file
+    return df.to_csv(index=False) 
+
+def converted_filename(name):
+    """
+    Name of the converted CSV for an uploaded questions file
+
+    Args:
+        name (str): Uploaded file name (.csv or .parquet)
+
+    Returns:
+        str: "converted_" file name with a .csv extension
+    """
+    stem, ext = os.path.splitext(name)
+    if ext.lower() == '.csv':
+        return f"converted_{name}"
+    return f"converted_{stem}.csv"
@@ -0,0 +1,167 @@
+import os
+import sqlite3
+from contextlib import closing
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+# SQLite file recording every row already submitted to the CFP Board
+SUBMISSION_INDEX_PATH = os.environ.get('CONVERTER_SUBMISSION_INDEX') or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'submitted_keys.sqlite3'
+)
+
+# Columns of the processed report that identify one submitted completion
+KEY_COLUMNS = ['Attendee CFP Board ID', 'CFP Program ID', 'Date Individual Completed']
+
+# Text standing for a missing ID or date (process_file leaves IDs missing and dates blank);
+# rows with one are never treated as submitted
+MISSING_KEY_VALUES = ['', 'nan', '<NA>']
+
+# SQLite page cache per connection, in kilobytes; large enough to keep the key index's upper levels in memory
+CACHE_KB = 64 * 1024
+
+# Keys sent to SQLite per executemany call
+BATCH_SIZE = 50000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submitted (
+    attendee_id TEXT NOT NULL,
+    program_id TEXT NOT NULL,
+    completed TEXT NOT NULL,
+    submitted_at TEXT NOT NULL,
+    PRIMARY KEY (attendee_id, program_id, completed)
+) WITHOUT ROWID
+"""
+
+def _batches(rows, size=BATCH_SIZE):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+class SubmissionIndex:
+    """
+    Local index of (attendee, program, completion date) keys already submitted
+
+    Keys are the primary key of a WITHOUT ROWID table, so each lookup is a
+    single index probe however many months of history are stored. Lookups and
+    inserts work on the distinct keys of a report in bulk rather than row by row.
+    """
+
+    def __init__(self, path=SUBMISSION_INDEX_PATH):
+        self.path = path
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_KB}')
+        conn.execute(_SCHEMA)
+        return conn
+
+    def new_rows_mask(self, df):
+        """
+        Find the rows of a processed report that have not been submitted yet
+
+        Args:
+            df (pandas.DataFrame): Output of utils.process_file
+
+        Returns:
+            pandas.Series: True for rows to submit, aligned with df
+        """
+        codes, keys = _distinct_keys(df)
+        submitted = np.zeros(len(keys), dtype=bool)
+
+        if keys:
+            with closing(self._connect()) as conn:
+                conn.execute(
+                    'CREATE TEMP TABLE candidate (id INTEGER PRIMARY KEY, attendee_id TEXT, program_id TEXT, completed TEXT)'
+                )
+                for batch in _batches(keys):
+                    conn.executemany('INSERT INTO candidate VALUES (?, ?, ?, ?)', batch)
+                found = conn.execute(
+                    'SELECT c.id FROM candidate c JOIN submitted s '
+                    'ON s.attendee_id = c.attendee_id AND s.program_id = c.program_id AND s.completed = c.completed'
+                ).fetchall()
+            submitted[[key_id for key_id, in found]] = True
+
+        # Rows without a complete key (code -1) are always new
+        is_new = np.ones(len(df), dtype=bool)
+        has_key = codes >= 0
+        is_new[has_key] = ~submitted[codes[has_key]]
+        return pd.Series(is_new, index=df.index)
+
+    def record(self, df):
+        """
+        Record the rows of a processed report as submitted
+
+        Args:
+            df (pandas.DataFrame): Rows that were exported
+
+        Returns:
+            int: Keys added; keys already in the index are left as they are
+        """
+        _, keys = _distinct_keys(df)
+        if not keys:
+            return 0
+
+        # Inserting in primary key order keeps B-tree page writes sequential
+        keys.sort(key=lambda key: key[1:])
+        submitted_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        with closing(self._connect()) as conn, conn:
+            before = conn.total_changes
+            for batch in _batches(keys):
+                conn.executemany(
+                    'INSERT OR IGNORE INTO submitted VALUES (?, ?, ?, ?)',
+                    [(attendee_id, program_id, completed, submitted_at) for _, attendee_id, program_id, completed in batch]
+                )
+            return conn.total_changes - before
+
+    def count(self):
+        """Number of keys recorded so far"""
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM submitted').fetchone()[0]
+
+def _distinct_keys(df):
+    """
+    Factorize the complete keys of a processed report
+
+    Each key column is factorized on its own (cheap for the categorical ID
+    columns) and the integer codes are combined, so no per-row tuples are built.
+
+    Returns:
+        tuple: (numpy.ndarray, list) the key number of every row, -1 where part
+            of the key is missing, and (key number, attendee, program, date)
+            tuples for the distinct keys
+    """
+    combined = np.zeros(len(df), dtype=np.int64)
+    complete = np.ones(len(df), dtype=bool)
+    column_codes = []
+    column_values = []
+
+    for col in KEY_COLUMNS:
+        codes, uniques = pd.factorize(df[col])
+        values = np.asarray(uniques, dtype=object).astype(str)
+        complete &= codes >= 0
+        complete[complete] = ~np.isin(values, MISSING_KEY_VALUES)[codes[complete]]
+
+        # Re-factorizing keeps the combined code below the row count, so it never overflows
+        combined, _ = pd.factorize(combined * (len(values) + 1) + codes)
+        column_codes.append(codes)
+        column_values.append(values)
+
+    key_codes = np.full(len(df), -1, dtype=np.int64)
+    if not complete.any():
+        return key_codes, []
+
+    rows = np.flatnonzero(complete)
+    key_codes[rows], _ = pd.factorize(combined[rows])
+
+    # First row of each key; assigning in reverse leaves the earliest row in place
+    first_rows = np.empty(key_codes[rows].max() + 1, dtype=np.int64)
+    first_rows[key_codes[rows][::-1]] = rows[::-1]
+
+    key_columns = [values[codes[first_rows]] for codes, values in zip(column_codes, column_values)]
+    return key_codes, list(zip(range(len(first_rows)), *(column.tolist() for column in key_columns)))
+
+# Index used by the CSV to XLSX Converter's delta mode
+default_submission_index = SubmissionIndex()
@@ -0,0 +1,91 @@
+// Add sidebar toggle functionality for mobile
+document.addEventListener('DOMContentLoaded', function() {
+    // Function to handle sidebar toggle
+    function setupSidebar() {
+        const body = document.querySelector('body');
+
+        // Create toggle button if it doesn't exist yet
+        if (!document.querySelector('.sidebar-toggle')) {
+            const toggleButton = document.createElement('button');
+            toggleButton.innerHTML = '☰';
+            toggleButton.setAttribute('aria-label', 'Toggle Sidebar');
+            toggleButton.setAttribute('title', 'Toggle Sidebar');
+            toggleButton.classList.add('sidebar-toggle');
+            toggleButton.style.cssText = `
+                position: fixed;
+                top: 10px;
+                left: 10px;
+                z-index: 1000;
+                background: #1e88e5;
+                color: white;
+                border: none;
+                border-radius: 4px;
+                width: 40px;
+                height: 40px;
+                font-size: 20px;
+                cursor: pointer;
+                display: none;
+                transition: transform 0.3s ease, background-color 0.3s ease;
+                box-shadow: 0 2px 5px rgba(0,0,0,0.2);
+            `;
+
+            // Toggle sidebar state on button click
+            toggleButton.addEventListener('click', function() {
+                body.classList.toggle('sidebar-collapsed');
+                localStorage.setItem('sidebarCollapsed', body.classList.contains('sidebar-collapsed'));
+            });
+
+            document.body.appendChild(toggleButton);
+        }
+
+        // Handle screen size changes
+        const mediaQuery = window.matchMedia('(max-width: 992px)');
+        function handleScreenChange(e) {
+            const toggleButton = document.querySelector('.sidebar-toggle');
+            if (e.matches) {
+                // Mobile view
+                toggleButton.style.display = 'block';
+
+                // Restore saved state or default to not collapsed
+                const wasCollapsed = localStorage.getItem('sidebarCollapsed') === 'true';
+                if (wasCollapsed) {
+                    body.classList.add('sidebar-collapsed');
+                } else {
+                    body.classList.remove('sidebar-collapsed');
+                }
+            } else {
+                // Desktop view
+                toggleButton.style.display = 'none';
+                body.classList.remove('sidebar-collapsed');
+            }
+        }
+
+        mediaQuery.addEventListener('change', handleScreenChange);
+        handleScreenChange(mediaQuery);
+
+        // Close sidebar when clicking on main content in mobile view
+        const mainContent = document.querySelector('.main');
+        if (mainContent) {
+            mainContent.addEventListener('click', function() {
+                if (mediaQuery.matches && !body.classList.contains('sidebar-collapsed')) {
+                    body.classList.add('sidebar-collapsed');
+                    localStorage.setItem('sidebarCollapsed', 'true');
+                }
+            });
+        }
+    }
+
+    // Initial setup
+    setupSidebar();
+
+    // Re-run setup when Streamlit reruns
+    const observer = new MutationObserver(function(mutations) {
+        mutations.forEach(function(mutation) {
+            if (mutation.addedNodes.length) {
+                setupSidebar();
+            }
+        });
+    });
+
+    observer.observe(document.body, { childList: true, subtree: true });
+});
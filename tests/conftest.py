@@ -0,0 +1,17 @@
+import pytest
+
+from shared.cache import default_cache
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test without results cached by an earlier one"""
+    default_cache.clear()
+    yield
+    default_cache.clear()
+
+def questions_csv(rows, prefix='Question'):
+    """Raw questions CSV bytes in the format the Exam Quiz Converter exports"""
+    lines = ['Question,answer choice A,answer choice B,answer choice C,answer choice D,Correct Answer']
+    for i in range(1, rows + 1):
+        lines.append(f'"{i}. {prefix} {i}?",Alpha {i},Beta {i},Gamma {i},Delta {i},Gamma {i}')
+    return '\n'.join(lines).encode()
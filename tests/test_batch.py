@@ -0,0 +1,39 @@
+from conftest import questions_csv
+from shared.batch import convert_question_files
+from shared.cache import default_cache
+
+def batch_files():
+    return [
+        ('first.csv', questions_csv(20, 'First')),
+        ('second.csv', questions_csv(5, 'Second')),
+        ('broken.csv', b'Question,answer choice A\nWhat?,Yes\n'),
+        ('third.csv', questions_csv(12, 'Third')),
+    ]
+
+def test_pool_matches_single_process():
+    files = batch_files()
+    pooled = convert_question_files(files, 'Category', include_ids=False, max_workers=2)
+    default_cache.clear()
+    inline = convert_question_files(files, 'Category', include_ids=False, max_workers=1)
+
+    assert [r['name'] for r in pooled] == [name for name, _ in files]
+    assert [(r['status'], r['message']) for r in pooled] == [(r['status'], r['message']) for r in inline]
+    for pooled_result, inline_result in zip(pooled, inline):
+        if inline_result['df'] is None:
+            assert pooled_result['df'] is None
+        else:
+            assert pooled_result['df'].equals(inline_result['df'])
+
+def test_pool_reports_progress_for_every_file():
+    progress = []
+    convert_question_files(batch_files(), 'Category', max_workers=2,
+                           on_progress=lambda done, total, result: progress.append((done, total)))
+
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+
+def test_pool_workers_draw_their_own_ids():
+    files = [(f'file{i}.csv', questions_csv(3, f'File {i}')) for i in range(3)]
+    results = convert_question_files(files, 'Category', max_workers=3)
+
+    first_ids = {int(result['df']['ID'].iloc[0]) for result in results}
+    assert len(first_ids) == 3
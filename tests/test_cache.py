@@ -0,0 +1,66 @@
+import io
+
+import pandas as pd
+
+from conftest import questions_csv
+from shared.batch import convert_question_files
+from shared.cache import ResultCache, default_cache, fingerprint
+from shared.question_utils import transform_csv
+
+def test_fingerprint_depends_on_content_not_identity():
+    df = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+
+    assert fingerprint(df, 'opt') == fingerprint(df.copy(), 'opt')
+    assert fingerprint(b'data') == fingerprint(bytearray(b'data'))
+    assert fingerprint(df) != fingerprint(df.astype({'a': float}))
+    # Parts are delimited, so different splits of the same text never collide
+    assert fingerprint('ab', 'c') != fingerprint('a', 'bc')
+    assert fingerprint(b'1') != fingerprint('1') != fingerprint(1)
+
+def test_lru_eviction_keeps_memory_within_budget():
+    cache = ResultCache(max_bytes=250)
+    cache.put('a', b'x' * 100)
+    cache.put('b', b'x' * 100)
+    cache.get('a')
+    cache.put('c', b'x' * 100)
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+    assert cache.get('c') is not None
+
+def test_disk_tier_serves_evicted_entries(tmp_path):
+    cache = ResultCache(max_bytes=150, disk_dir=str(tmp_path))
+    cache.put('a', b'x' * 100)
+    cache.put('b', b'y' * 100)
+    cache.clear()
+
+    assert cache.get('a') == b'x' * 100
+    assert ResultCache(disk_dir=str(tmp_path)).get('b') == b'y' * 100
+
+def test_deferred_computes_once():
+    cache = ResultCache()
+    calls = []
+    build = cache.deferred('key', lambda: calls.append(1) or b'file')
+
+    assert calls == []
+    assert build() == build() == b'file'
+    assert calls == [1]
+
+def test_converted_files_are_cached_as_parquet_bytes():
+    data = questions_csv(10)
+    first, = convert_question_files([('questions.csv', data)], 'Finance')
+
+    cached = default_cache.get(fingerprint('question_file', data, 'Finance', True))
+    assert isinstance(cached['df'], bytes)
+
+    # A hit rebuilds the same frame, IDs included, under the new upload's name
+    second, = convert_question_files([('renamed.csv', data)], 'Finance')
+    assert second['name'] == 'renamed.csv'
+    pd.testing.assert_frame_equal(second['df'], first['df'])
+
+def test_transform_reuses_cached_ids():
+    df = pd.read_csv(io.BytesIO(questions_csv(5)))
+    first = transform_csv(df.copy(), category='Finance')
+    second = transform_csv(df.copy(), category='Finance')
+
+    pd.testing.assert_frame_equal(first, second)
@@ -0,0 +1,67 @@
+import io
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from utils import (
+    EXPORT_NUMBER_FORMATS, REPORT_DTYPES, REQUIRED_COLUMNS, process_file, process_file_to_xlsx, read_report, write_xlsx
+)
+
+REPORT = '\n'.join([
+    'Last name,First name,Email,License number,Course,CFP Board Course ID,Completed,Credits',
+    'Smith,Ann,ann@example.com,100001,"Ethics, part 1",240001,"January 5, 2025",2',
+    ' Jones ,Bob,bob@example.com,"100,002","Tax\nPlanning",240002,2025-01-06,1',
+    'Lee,,lee@example.com,,Retirement,240001,01/07/2025,2',
+    'Brown,Cy,cy@example.com,100004,Estate,NA,TBD,2',
+    'Green,Di,di@example.com,100005.0,Insurance,240003,,1',
+]).encode()
+
+def pandas_report(data):
+    """The report as pandas' CSV reader loads the required columns"""
+    return pd.read_csv(io.BytesIO(data), usecols=REQUIRED_COLUMNS, dtype=REPORT_DTYPES)
+
+def test_pyarrow_reader_matches_pandas_reader():
+    actual = read_report(REPORT)[REQUIRED_COLUMNS]
+    expected = pandas_report(REPORT)[REQUIRED_COLUMNS]
+
+    # pyarrow gives None for a missing string where pandas gives NaN
+    pd.testing.assert_frame_equal(actual.isna(), expected.isna())
+    pd.testing.assert_frame_equal(actual.fillna(''), expected.fillna(''))
+
+def test_processed_report_matches_pandas_reader():
+    expected = process_file(pandas_report(REPORT))
+    actual = process_file(read_report(REPORT))
+
+    pd.testing.assert_frame_equal(actual.astype(object), expected.astype(object))
+    assert actual.attrs['unparsed_dates'] == expected.attrs['unparsed_dates']
+
+def test_missing_required_column_is_reported_before_reading():
+    with pytest.raises(ValueError, match='Missing required columns: Completed'):
+        read_report(b'Last name,First name,License number,CFP Board Course ID\nA,B,1,2\n')
+
+def workbook_rows(data):
+    """Cell values of every row of an XLSX file, header included"""
+    return list(load_workbook(io.BytesIO(data), read_only=True).active.values)
+
+def test_chunked_export_matches_whole_file_export():
+    whole = io.BytesIO()
+    write_xlsx([process_file(read_report(REPORT))], whole, number_formats=EXPORT_NUMBER_FORMATS)
+    chunked = io.BytesIO()
+    unparsed_dates = []
+    rows = process_file_to_xlsx(io.BytesIO(REPORT), chunked, chunksize=2, unparsed_dates=unparsed_dates)
+
+    assert rows == 5
+    assert workbook_rows(chunked.getvalue()) == workbook_rows(whole.getvalue())
+    assert unparsed_dates == process_file(read_report(REPORT)).attrs['unparsed_dates']
+
+def test_missing_ids_are_exported_as_empty_cells():
+    output = io.BytesIO()
+    process_file_to_xlsx(io.BytesIO(REPORT), output)
+    header, *rows = workbook_rows(output.getvalue())
+
+    program_ids = [row[header.index('CFP Program ID')] for row in rows]
+    attendee_ids = [row[header.index('Attendee CFP Board ID')] for row in rows]
+    assert program_ids == ['240001', '240002', '240001', None, '240003']
+    # A license number written with a thousands separator does not parse as a number
+    assert attendee_ids == ['100001', None, None, '100004', '100005']
@@ -0,0 +1,16 @@
+import warnings
+
+import pandas as pd
+
+from shared.dates import DateNormalizer
+
+def test_fallback_parsing_does_not_warn_per_value():
+    values = pd.Series(['January 5, 2025', '13.01.2025 10:00', '25/12/2025 08:00', 'TBD'])
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter('always')
+        parsed, unparsed = DateNormalizer().parse(values)
+
+    assert not [warning for warning in caught if issubclass(warning.category, UserWarning)]
+    assert parsed.dt.strftime('%Y-%m-%d').tolist()[:3] == ['2025-01-05', '2025-01-13', '2025-12-25']
+    assert unparsed == [(3, 'TBD')]
@@ -0,0 +1,70 @@
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from shared.batch import convert_question_file
+from shared.handoff import blanks_to_missing, is_prevalidated, read_parquet_handoff, to_parquet_bytes
+from shared.parser import ExamParser
+from shared.question_utils import validate_raw_csv
+
+VALID = """1. Which statement is correct?
+A. The sum
+B. *The present value
+C. The future value
+D. None of these
+
+2. Which factor matters?
+A. *Interest rate
+B. Payment frequency
+C. Time period
+D. All of the above
+"""
+# Question 2 has no marked answer and question 3 is missing choice D
+INVALID = VALID.replace('A. *Interest', 'A. Interest') + """
+3. Short question?
+A. One
+B. *Two
+C. Three
+"""
+
+def exports(content):
+    """The Exam Quiz Converter's CSV and Parquet exports of the same exam"""
+    df = ExamParser().process_file(content)
+    handoff_df = blanks_to_missing(df)
+    is_valid, message = validate_raw_csv(handoff_df.copy(deep=False))
+    parquet = to_parquet_bytes(handoff_df, validated=is_valid, message=message)
+    return df.to_csv(index=False).encode(), parquet
+
+@pytest.mark.parametrize('content', [VALID, INVALID])
+def test_parquet_handoff_converts_like_the_csv_export(content):
+    csv_data, parquet_data = exports(content)
+    from_csv = convert_question_file('questions.csv', csv_data, 'Finance', include_ids=False)
+    from_parquet = convert_question_file('questions.parquet', parquet_data, 'Finance', include_ids=False)
+
+    assert (from_parquet['status'], from_parquet['message']) == (from_csv['status'], from_csv['message'])
+    if from_csv['status'] == 'success':
+        pd.testing.assert_frame_equal(from_parquet['df'], from_csv['df'])
+
+def test_handoff_round_trip_keeps_validation():
+    _, parquet_data = exports(VALID)
+    df, handoff = read_parquet_handoff(parquet_data)
+
+    assert handoff['validated'] is True
+    assert is_prevalidated(df, handoff)
+
+def test_edited_handoff_is_validated_again():
+    _, parquet_data = exports(VALID)
+    table = pq.read_table(io.BytesIO(parquet_data))
+    df = table.to_pandas()
+    df.loc[0, 'Correct Answer'] = 'Not a choice'
+
+    # Keep the original metadata, as a tool editing the file in place might
+    edited = io.BytesIO()
+    pq.write_table(table.from_pandas(df, preserve_index=False).replace_schema_metadata(table.schema.metadata), edited)
+    result = convert_question_file('questions.parquet', edited.getvalue(), 'Finance')
+
+    assert not is_prevalidated(*read_parquet_handoff(edited.getvalue()))
+    assert result['status'] == 'error'
+    assert result['message'] == "Correct answer doesn't match any choice in row 1"
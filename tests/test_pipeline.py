@@ -0,0 +1,79 @@
+import io
+import random
+
+import pandas as pd
+import pytest
+
+from shared.parser import ExamParser
+from shared.pipeline import exam_to_import_csv
+from shared.question_utils import convert_df_to_csv, transform_csv, validate_raw_csv
+
+def two_step(content, category, answer_key_content=None, include_ids=True):
+    """Exam Quiz Converter CSV export, re-read and converted by the Question Converter"""
+    exported = ExamParser().process_file(content, answer_key_content).to_csv(index=False)
+    df = pd.read_csv(io.StringIO(exported))
+    is_valid, message = validate_raw_csv(df)
+    if not is_valid:
+        return False, message, None
+    return True, message, convert_df_to_csv(transform_csv(df, category=category, include_ids=include_ids))
+
+def exam(*questions):
+    """Exam text from (question, choices) pairs; a '*' in a choice marks the answer"""
+    blocks = []
+    for number, (question, choices) in enumerate(questions, start=1):
+        lines = [f"{number}. {question}"] + [f"{letter}. {choice}" for letter, choice in zip('ABCD', choices)]
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks)
+
+MARKED = exam(
+    ("Which statement about an annuity is correct?", ["The sum", "*The present value", "The future value", "None of these"]),
+    ("What does the client's Inc. holding pay?", ["Dividends", "Interest", "*Both", "Neither"]),
+    ("12. Which factor matters?", ["*Interest rate", "Payment frequency", "Time period", "All of the above"]),
+)
+UNMARKED = exam(
+    ("First question?", ["Red", "Green", "Blue", "Yellow"]),
+    ("Second question?", ["North", "South", "East", "West"]),
+)
+MISSING_CHOICE = exam(
+    ("Complete question?", ["One", "*Two", "Three", "Four"]),
+    ("Short question?", ["One", "*Two", "Three"]),
+)
+
+@pytest.mark.parametrize('content, answer_key', [
+    (MARKED, None),
+    (UNMARKED, "1. C\n2. D"),
+    (UNMARKED, "1: B 2: A"),
+    (UNMARKED, None),
+    (MISSING_CHOICE, None),
+])
+@pytest.mark.parametrize('include_ids', [True, False])
+def test_fused_path_matches_two_step_path(content, answer_key, include_ids):
+    # Both paths draw one starting ID, so the same seed gives the same IDs
+    random.seed(42)
+    expected = two_step(content, 'Finance', answer_key, include_ids)
+    random.seed(42)
+    actual = exam_to_import_csv(content, 'Finance', answer_key, include_ids)
+
+    assert actual == expected
+
+def test_fused_path_keeps_numeric_text_as_written():
+    content = exam(
+        ("What is the rate?", ["1.25", "*2.50", "3.75", "5.00"]),
+        ("What is the fee?", ["*1.00", "2.00", "3.00", "4.00"]),
+    )
+
+    _, _, fused = exam_to_import_csv(content, 'Finance', include_ids=False)
+    _, _, round_tripped = two_step(content, 'Finance', include_ids=False)
+
+    assert '1.25|2.50|3.75|5.00,2.50' in fused
+    # Re-reading the CSV export types the all-numeric columns as floats
+    assert '1.25|2.5|3.75|5.0,2.5' in round_tripped
+
+def test_fused_path_keeps_missing_value_markers_as_text():
+    content = exam(("Which value is unavailable?", ["*NA", "Zero", "One", "Two"]))
+
+    assert exam_to_import_csv(content, 'Finance', include_ids=False)[0] is True
+    # The CSV reader takes "NA" for a missing value
+    assert two_step(content, 'Finance', include_ids=False)[:2] == (
+        False, "Empty cells found in required columns (row 1)"
+    )
@@ -0,0 +1,110 @@
+import io
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from shared.question_utils import transform_csv, validate_raw_csv
+
+CHOICES = ['answer choice A', 'answer choice B', 'answer choice C', 'answer choice D']
+REQUIRED = ['Question'] + CHOICES + ['Correct Answer']
+
+def reference_validate(df):
+    """Row-by-row validation, as the checks read before they were vectorized"""
+    for col in REQUIRED:
+        if col not in df.columns:
+            return False, 'missing'
+    empty = [i + 1 for i, row in df.iterrows() if any(pd.isna(row[col]) for col in REQUIRED)]
+    if empty:
+        return False, ('empty', empty)
+    mismatched = [
+        i + 1 for i, row in df.iterrows()
+        if str(row['Correct Answer']).strip() not in [str(row[col]).strip() for col in CHOICES]
+    ]
+    if mismatched:
+        return False, ('mismatch', mismatched)
+    return True, None
+
+def reference_transform(df, category):
+    """Row-by-row transform with blank IDs"""
+    rows = []
+    for i, row in df.iterrows():
+        if pd.isna(row['Question']):
+            continue
+        title = re.sub(r'^\d+\.\s*', '', str(row['Question']).strip())
+        rows.append({
+            'ID': '',
+            'Title': title,
+            'Category': category,
+            'Type': 'single-choice',
+            'Post Content': title,
+            'Status': 'publish',
+            'Menu Order': i + 1,
+            'Options': '|'.join(str(row[col]).strip() for col in CHOICES),
+            'Answer': str(row['Correct Answer']).strip(),
+        })
+    return pd.DataFrame(rows)
+
+CSV_CASES = {
+    'valid': (
+        'Question,answer choice A,answer choice B,answer choice C,answer choice D,Correct Answer\n'
+        '"1. What is it?",Red, Green ,Blue,Yellow,Green\n'
+        '2.   Numbers?,1,2,3,4,3\n'
+        'Plain,a,b,c,d,d\n'
+    ),
+    'numeric': (
+        'Question,answer choice A,answer choice B,answer choice C,answer choice D,Correct Answer\n'
+        'Rate?,1.25,2.5,3.75,5.0,2.5\n'
+        'Fee?,1.0,2.0,3.0,4.0,4.0\n'
+    ),
+    'empty cells': (
+        'Question,answer choice A,answer choice B,answer choice C,answer choice D,Correct Answer\n'
+        'One?,a,b,c,d,a\n'
+        'Two?,a,,c,d,a\n'
+        'Three?,a,b,c,d,\n'
+    ),
+    'mismatch': (
+        'Question,answer choice A,answer choice B,answer choice C,answer choice D,Correct Answer\n'
+        'One?,a,b,c,d,e\n'
+        'Two?,a,b,c,d,b\n'
+        'Three?,a,b,c,d,B\n'
+    ),
+}
+
+@pytest.mark.parametrize('name', CSV_CASES)
+def test_validation_matches_row_by_row_checks(name):
+    df = pd.read_csv(io.StringIO(CSV_CASES[name]))
+    is_valid, message = validate_raw_csv(df.copy())
+    expected_valid, detail = reference_validate(df)
+
+    assert is_valid == expected_valid
+    if detail:
+        kind, rows = detail
+        listed = [int(n) for n in re.findall(r'\d+', message)]
+        assert listed == rows
+        assert ('Empty cells' in message) == (kind == 'empty')
+
+def test_missing_columns_are_reported():
+    df = pd.DataFrame({'Question': ['One?'], 'answer choice A': ['a']})
+    assert validate_raw_csv(df) == (
+        False, "Missing required columns: answer choice B, answer choice C, answer choice D, Correct Answer"
+    )
+
+@pytest.mark.parametrize('name', ['valid', 'numeric'])
+def test_transform_matches_row_by_row_mapping(name):
+    df = pd.read_csv(io.StringIO(CSV_CASES[name]))
+    actual = transform_csv(df.copy(), category='Finance', include_ids=False)
+
+    expected = reference_transform(df, 'Finance')
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+def test_transform_skips_rows_without_a_question_but_keeps_their_numbers():
+    df = pd.read_csv(io.StringIO(CSV_CASES['valid']))
+    df.loc[1, 'Question'] = np.nan
+    actual = transform_csv(df.copy(), category='Finance', include_ids=True)
+
+    assert actual['Menu Order'].tolist() == [1, 3]
+    assert actual['ID'].iloc[1] - actual['ID'].iloc[0] == 2
+    pd.testing.assert_frame_equal(actual.drop(columns='ID'),
+                                  reference_transform(df, 'Finance').drop(columns='ID'), check_dtype=False)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from shared.submission_index import KEY_COLUMNS, SubmissionIndex
+
+def report(rows, seed):
+    """Processed-report style frame with repeated keys and some missing key parts"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'CFP Program ID': rng.integers(240000, 240020, rows).astype(str),
+        'Date Individual Completed': [f"01/{day:02d}/2025" for day in rng.integers(1, 29, rows)],
+        'Attendee CFP Board ID': rng.integers(100000, 100050, rows).astype(str),
+        'attendee last name': 'Last',
+    })
+    df.loc[rng.random(rows) < 0.05, 'Attendee CFP Board ID'] = np.nan
+    df.loc[rng.random(rows) < 0.05, 'Date Individual Completed'] = ''
+    for col in ['CFP Program ID', 'Attendee CFP Board ID']:
+        df[col] = df[col].astype('category')
+    return df
+
+def reference_keys(df):
+    """Complete keys of a report, one tuple per row (None where part of the key is missing)"""
+    keys = []
+    for values in df[KEY_COLUMNS].astype(object).itertuples(index=False, name=None):
+        complete = all(isinstance(value, str) and value not in ('', 'nan', '<NA>') for value in values)
+        keys.append(values if complete else None)
+    return keys
+
+def test_new_rows_mask_matches_row_by_row_lookup(tmp_path):
+    index = SubmissionIndex(str(tmp_path / 'index.sqlite3'))
+    first, second = report(2000, seed=1), report(2000, seed=2)
+
+    assert index.new_rows_mask(first).all()
+    added = index.record(first)
+
+    submitted = {key for key in reference_keys(first) if key is not None}
+    assert added == len(submitted) == index.count()
+
+    expected = [key is None or key not in submitted for key in reference_keys(second)]
+    assert index.new_rows_mask(second).tolist() == expected
+
+def test_record_ignores_keys_already_submitted(tmp_path):
+    index = SubmissionIndex(str(tmp_path / 'index.sqlite3'))
+    df = report(500, seed=3)
+
+    index.record(df)
+    assert index.record(df) == 0
+    assert index.record(df.iloc[::-1]) == 0
+
+def test_rows_without_a_complete_key_are_always_new(tmp_path):
+    index = SubmissionIndex(str(tmp_path / 'index.sqlite3'))
+    df = report(500, seed=4)
+    index.record(df)
+
+    mask = index.new_rows_mask(df)
+    incomplete = [key is None for key in reference_keys(df)]
+    assert mask[incomplete].all()
+    assert not mask[[not flag for flag in incomplete]].any()
@@ -1,28 +1,96 @@
+import io
 import pandas as pd
 from datetime import datetime
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import numbers, Alignment, Font
+from openpyxl.utils import get_column_letter
+from shared.cache import default_cache, fingerprint
+from shared.dates import default_normalizer
+from shared.instrumentation import timed
+
+# Columns the CFP credit report must contain
+REQUIRED_COLUMNS = [
+    'CFP Board Course ID',
+    'Completed',
+    'License number',
+    'Last name',
+    'First name'
+]
+
+# Required columns are loaded as text; clean_data does the typing
+REPORT_DTYPES = {col: str for col in REQUIRED_COLUMNS}
+
+# pandas' default missing-value markers, so both CSV readers agree on what is empty
+REPORT_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+# Rows read per chunk in streaming mode
+DEFAULT_CHUNKSIZE = 50000
+
+# Rows shown in the input preview
+PREVIEW_ROWS = 5
+
+# Number formats for the ID columns of the exported workbook
+EXPORT_NUMBER_FORMATS = {
+    'CFP Program ID': numbers.FORMAT_GENERAL,
+    'Attendee CFP Board ID': numbers.FORMAT_NUMBER
+}
 
 def validate_columns(df, required_columns):
     """Validate if required columns exist in the dataframe"""
     missing_columns = [col for col in required_columns if col not in df.columns]
     return len(missing_columns) == 0, missing_columns
 
+def map_distinct(series, func, categorical=True):
+    """Apply a column transform to each distinct value once and map the results back onto the rows.
+
+    The result is a categorical column unless categorical is False, in which case it keeps func's dtype.
+    Missing values are passed to func like any other value, so it sees exactly what a full-column call would.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    if isinstance(uniques.dtype, pd.CategoricalDtype):
+        # func works on plain values, as it would on an uncategorized column
+        uniques = np.asarray(uniques)
+    mapped = func(pd.Series(uniques))
+    if not categorical:
+        return pd.Series(mapped.take(codes).to_numpy(), index=series.index, name=series.name, dtype=mapped.dtype)
+
+    category_codes, categories = pd.factorize(mapped)
+    return pd.Series(pd.Categorical.from_codes(category_codes[codes], categories),
+                     index=series.index, name=series.name)
+
 def clean_data(df):
     """Clean and prepare data"""
     # Create copy to avoid modifying original
     df_clean = df.copy()
 
-    # Remove any trailing/leading whitespace
+    # Remove any trailing/leading whitespace; text columns become categorical so repeated values are handled once
     for col in df_clean.columns:
         if df_clean[col].dtype == 'object':
-            df_clean[col] = df_clean[col].str.strip()
+            df_clean[col] = map_distinct(df_clean[col], lambda values: values.str.strip())
 
-    # Convert date format
-    df_clean['Completed'] = pd.to_datetime(df_clean['Completed'])
+    # Convert date format, parsing each distinct date once; rows that fail are reported rather than raised
+    df_clean['Completed'], unparsed_dates = default_normalizer.parse(df_clean['Completed'])
+    df_clean.attrs['unparsed_dates'] = unparsed_dates
 
     # Convert numeric columns and handle empty values
-    df_clean['License number'] = pd.to_numeric(df_clean['License number'].replace('', np.nan), errors='coerce').astype('Int64')
-    df_clean['CFP Board Course ID'] = pd.to_numeric(df_clean['CFP Board Course ID'], errors='coerce')
+    df_clean['License number'] = map_distinct(
+        df_clean['License number'],
+        lambda values: pd.to_numeric(values.replace('', np.nan), errors='coerce').astype('Int64'),
+        categorical=False
+    )
+    # Nullable integers, so a blank ID does not turn the column to float and add '.0' to every ID
+    df_clean['CFP Board Course ID'] = map_distinct(
+        df_clean['CFP Board Course ID'],
+        lambda values: pd.to_numeric(values.replace('', np.nan), errors='coerce').astype('Int64'),
+        categorical=False
+    )
 
     return df_clean
 
@@ -41,36 +109,156 @@ def map_columns(df):
     df_mapped = df_mapped.rename(columns=mapping)
 
     # Format date column as short date
-    df_mapped['Date Individual Completed'] = df_mapped['Date Individual Completed'].dt.strftime('%m/%d/%Y')
+    df_mapped['Date Individual Completed'] = default_normalizer.format(df_mapped['Date Individual Completed'], '%m/%d/%Y')
 
-    #Format numeric columns to remove commas
-    df_mapped['CFP Program ID'] = df_mapped['CFP Program ID'].astype(str).str.replace(',', '', regex=False)
-    df_mapped['Attendee CFP Board ID'] = df_mapped['Attendee CFP Board ID'].astype(str).str.replace('.0', '', regex=False).str.replace(',', '', regex=False)
+    #Format numeric columns to remove commas, once per distinct ID; strings are only expanded at export.
+    # Missing IDs stay missing, so they are exported as empty cells rather than the text '<NA>'
+    df_mapped['CFP Program ID'] = map_distinct(
+        df_mapped['CFP Program ID'],
+        lambda values: values.astype(str).str.replace(',', '', regex=False).where(values.notna())
+    )
+    df_mapped['Attendee CFP Board ID'] = map_distinct(
+        df_mapped['Attendee CFP Board ID'],
+        lambda values: values.astype(str).str.replace('.0', '', regex=False).str.replace(',', '', regex=False)
+        .where(values.notna())
+    )
 
     # Add empty Attendee Middle Name column at the end
     df_mapped['Attendee Middle Name'] = ''
 
     return df_mapped
 
+def check_required_columns(df):
+    """Raise ValueError if the report is missing any required column"""
+    columns_valid, missing_columns = validate_columns(df, REQUIRED_COLUMNS)
+    if not columns_valid:
+        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+
+@timed('transform', 'cfp report', rows=len)
 def process_file(input_df):
     """Process the input dataframe and return mapped dataframe"""
-    required_columns = [
-        'CFP Board Course ID',
-        'Completed',
-        'License number',
-        'Last name',
-        'First name'
-    ]
-
     # Validate columns
-    columns_valid, missing_columns = validate_columns(input_df, required_columns)
-    if not columns_valid:
-        raise ValueError(f"Missing required columns: {', '.join(missing_columns)}")
+    check_required_columns(input_df)
+
+    # Reuse the result when the same report is processed again
+    return default_cache.get_or_compute(
+        fingerprint('process_file', input_df),
+        lambda: map_columns(clean_data(input_df))
+    )
+
+def read_header(csv_source):
+    """Read only the header row of a CSV, leaving file objects at their start position"""
+    start = csv_source.tell() if hasattr(csv_source, 'seek') else None
+    header = pd.read_csv(csv_source, nrows=0)
+    if start is not None:
+        csv_source.seek(start)
+    return header
+
+@timed('read', 'cfp report columns', rows=len)
+def read_report(data):
+    """Read only the required columns of a CFP credit report from raw CSV bytes.
+
+    The header is validated before any data is read. Columns are loaded as text with pyarrow's
+    multithreaded CSV reader, falling back to pandas' C parser for files pyarrow rejects.
+    """
+    check_required_columns(read_header(io.BytesIO(data)))
+
+    try:
+        table = pa_csv.read_csv(
+            pa.BufferReader(data),
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=REQUIRED_COLUMNS,
+                column_types={col: pa.string() for col in REQUIRED_COLUMNS},
+                null_values=REPORT_NA_VALUES,
+                strings_can_be_null=True
+            ),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True)
+        )
+    except pa.ArrowInvalid:
+        return pd.read_csv(io.BytesIO(data), usecols=REQUIRED_COLUMNS, dtype=REPORT_DTYPES)
+
+    return table.to_pandas()
+
+def read_preview(data, rows=PREVIEW_ROWS):
+    """Read the first rows of a CSV, with all its columns, for display"""
+    return pd.read_csv(io.BytesIO(data), nrows=rows)
+
+def iter_process_file(csv_source, chunksize=DEFAULT_CHUNKSIZE):
+    """Process a CSV in bounded chunks and yield one mapped dataframe per chunk.
+
+    Required columns are validated once against the header before any data is read,
+    and only those columns are loaded.
+    """
+    check_required_columns(read_header(csv_source))
+
+    with pd.read_csv(csv_source, chunksize=chunksize, usecols=REQUIRED_COLUMNS, dtype=REPORT_DTYPES) as reader:
+        for chunk in reader:
+            yield map_columns(clean_data(chunk))
+
+@timed('export', 'xlsx workbook', rows=lambda total_rows: total_rows)
+def write_xlsx(frames, output, sheet_name='Sheet1', number_formats=None):
+    """Stream dataframes into a write-only workbook and return the number of data rows written.
+
+    Column number formats are set up front on one reusable styled cell per column,
+    so no per-cell formatting pass is needed after the data is written.
+    """
+    number_formats = number_formats or {}
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet_name)
+
+    total_rows = 0
+    styled_cells = None
+    for frame in frames:
+        if styled_cells is None:
+            styled_cells = _prepare_sheet(worksheet, frame.columns, number_formats)
+
+        # Empty values are written as blank strings, as DataFrame.to_excel does
+        values = frame.astype(object).where(frame.notna(), '')
+        for row in values.itertuples(index=False, name=None):
+            if styled_cells:
+                row = list(row)
+                for col_idx, cell in styled_cells:
+                    cell.value = row[col_idx]
+                    row[col_idx] = cell
+            worksheet.append(row)
+        total_rows += len(frame)
+
+    workbook.save(output)
+    return total_rows
+
+def _prepare_sheet(worksheet, columns, number_formats):
+    """Write the header row and set column formats, returning the styled cells to reuse per row"""
+    styled_cells = []
+    for col_idx, column in enumerate(columns):
+        if column in number_formats:
+            # Column styles must be set before any rows are written in write-only mode
+            worksheet.column_dimensions[get_column_letter(col_idx + 1)].number_format = number_formats[column]
+            cell = WriteOnlyCell(worksheet)
+            cell.number_format = number_formats[column]
+            styled_cells.append((col_idx, cell))
+
+    # Header matches the bold, centered, borderless header of the reference export
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(worksheet, value=column)
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center', vertical='top')
+        header.append(cell)
+    worksheet.append(header)
+
+    return styled_cells
 
-    # Clean data
-    df_clean = clean_data(input_df)
+def process_file_to_xlsx(csv_source, output, chunksize=DEFAULT_CHUNKSIZE, unparsed_dates=None):
+    """Convert a CFP credit report CSV straight into an XLSX workbook without loading it whole.
 
-    # Map columns
-    df_mapped = map_columns(df_clean)
+    If unparsed_dates is a list, it is extended with the (row, value) pairs of dates that could not be parsed.
+    """
+    frames = iter_process_file(csv_source, chunksize=chunksize)
+    if unparsed_dates is not None:
+        frames = _collect_unparsed_dates(frames, unparsed_dates)
+    return write_xlsx(frames, output, number_formats=EXPORT_NUMBER_FORMATS)
 
-    return df_mapped
\ No newline at end of file
+def _collect_unparsed_dates(frames, unparsed_dates):
+    for frame in frames:
+        unparsed_dates.extend(frame.attrs.get('unparsed_dates', []))
+        yield frame
\ No newline at end of file